@@ -1,5 +1,9 @@
 class Agent:
     def __init__(self):
+        self.reset()
+        
+    def reset(self):
+        """Возвращает агента к началу игры: способности снова закрыты"""
         self.abilities = {
             "basic_repair": True,
             "enhanced_connections": False,
@@ -1,69 +1,64 @@
 import pygame
 import math
-import time
-import random
+from .sim.connection import Connection as ConnectionModel
+from .sprites import blit_circle
+from .text import render_text
+from .particles import particle_system, LAYER_LINKS
 
-class Connection:
-    def __init__(self, node1, node2, connection_type="normal", duration=None):
-        self.node1 = node1
-        self.node2 = node2
-        self.type = connection_type
-        self.color = self.get_color()
-        self.width = 3 if connection_type == "normal" else 5
-        self.distance = self.calculate_distance()
-        self.created_time = time.time()
-        self.duration = duration  # Для временных связей
-        self.animation_time = 0.0
-        self.particles = []
-        
-    def calculate_distance(self):
-        return ((self.node1.x - self.node2.x) ** 2 + (self.node1.y - self.node2.y) ** 2) ** 0.5
-        
-    def is_too_long(self):
-        # Максимальная длина связи - 250 пикселей
-        return self.distance > 250
+
+def draw_alpha_line(screen, color, start_pos, end_pos, width):
+    """Рисует полупрозрачную линию через поверхность размером с ее габариты,
+    а не с весь экран"""
+    pad = width + 1
+    left = int(math.floor(min(start_pos[0], end_pos[0]))) - pad
+    top = int(math.floor(min(start_pos[1], end_pos[1]))) - pad
+    right = int(math.ceil(max(start_pos[0], end_pos[0]))) + pad
+    bottom = int(math.ceil(max(start_pos[1], end_pos[1]))) + pad
     
-    def is_expired(self):
-        """Проверяет, истекла ли временная связь"""
-        if self.duration is None:
-            return False
-        return time.time() - self.created_time > self.duration
+    s = pygame.Surface((right - left + 1, bottom - top + 1), pygame.SRCALPHA)
+    pygame.draw.line(s, color,
+                     (start_pos[0] - left, start_pos[1] - top),
+                     (end_pos[0] - left, end_pos[1] - top),
+                     width)
+    screen.blit(s, (left, top))
+
+
+def draw_solid_line(screen, color, start_pos, end_pos, width):
+    """Рисует линию без отсечения.
+
+    pygame растрирует толстую линию, обрезанную областью отсечения, иначе,
+    чем целую, и при частичной перерисовке связь сдвигалась на пиксель.
+    Вне области отсечения поверхность все равно перерисуется до вывода.
+    """
+    clip = screen.get_clip()
+    screen.set_clip(None)
+    pygame.draw.line(screen, color, start_pos, end_pos, width)
+    screen.set_clip(clip)
+
+class Connection(ConnectionModel):
+    """Связь с частицами и отрисовкой; состояние и логика - в game.sim.connection"""
     
-    def get_time_remaining(self):
-        """Возвращает оставшееся время для временной связи"""
-        if self.duration is None:
-            return None
-        return max(0, self.duration - (time.time() - self.created_time))
-        
-    def get_color(self):
-        colors = {
-            "normal": (0, 255, 0),
-            "enhanced": (0, 200, 255),
-            "temporary": (255, 200, 0),
-            "firewall": (100, 200, 255),
-            "invalid": (255, 0, 0)  # Для слишком длинных связей
-        }
-        return colors.get(self.type, (0, 255, 0))
+    def __init__(self, node1, node2, connection_type="normal", duration=None, clock=None, rng=None, distance=None):
+        super().__init__(node1, node2, connection_type, duration, clock, rng, distance)
+        self.particle_timer = 0.0
+        
+    # Частица живет 1/3 с; испускаем так, чтобы на связи их было около пяти
+    PARTICLE_INTERVAL = 1000.0 / 15
     
     def update(self, dt):
         """Обновляет анимацию связи"""
-        self.animation_time += dt / 1000.0
-        
-        # Обновляем частицы
-        for particle in self.particles[:]:
-            particle['life'] -= dt / 1000.0 * 3
-            particle['x'] += particle.get('vx', 0) * dt / 16.0
-            particle['y'] += particle.get('vy', 0) * dt / 16.0
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        super().update(dt)
         
         # Создаем новые частицы для активных связей
-        if self.type in ["enhanced", "normal"] and len(self.particles) < 5:
-            self.create_particle()
+        if self.type in ["enhanced", "normal"]:
+            self.particle_timer += dt
+            while self.particle_timer >= self.PARTICLE_INTERVAL:
+                self.particle_timer -= self.PARTICLE_INTERVAL
+                self.create_particle()
 
     def create_particle(self):
         """Создает частицу, движущуюся по связи"""
-        t = random.uniform(0, 1) if hasattr(self, '_last_t') else 0
+        t = self.rng.effects.uniform(0, 1) if hasattr(self, '_last_t') else 0
         self._last_t = (t + 0.1) % 1.0
         
         x = self.node1.x + (self.node2.x - self.node1.x) * t
@@ -72,23 +67,31 @@ class Connection:
         # Направление движения
         dx = self.node2.x - self.node1.x
         dy = self.node2.y - self.node1.y
-        length = math.sqrt(dx*dx + dy*dy)
+        length = self.distance
         if length > 0:
             vx = (dx / length) * 2
             vy = (dy / length) * 2
         else:
             vx, vy = 0, 0
         
-        self.particles.append({
-            'x': x,
-            'y': y,
-            'vx': vx,
-            'vy': vy,
-            'color': self.color,
-            'size': 3,
-            'life': 1.0
-        })
+        particle_system.emit(x, y, vx, vy, life=1.0, size=3, color=self.color,
+                             decay=3.0, layer=LAYER_LINKS)
 
+    # Запас вокруг линии: свечение, импульсы и таймер временной связи
+    BOUNDS_MARGIN = 24
+    
+    def is_animated(self):
+        """Меняется ли картинка связи от кадра к кадру"""
+        return self.type in ("enhanced", "temporary")
+    
+    def get_bounds(self):
+        """Прямоугольник, в который помещается отрисовка связи"""
+        left = min(self.node1.x, self.node2.x) - self.BOUNDS_MARGIN
+        top = min(self.node1.y, self.node2.y) - self.BOUNDS_MARGIN
+        width = abs(self.node1.x - self.node2.x) + self.BOUNDS_MARGIN * 2
+        height = abs(self.node1.y - self.node2.y) + self.BOUNDS_MARGIN * 2
+        return pygame.Rect(left, top, width, height)
+    
     def draw(self, screen):
         # Для временных связей показываем предупреждение
         if self.type == "temporary":
@@ -110,14 +113,6 @@ class Connection:
             self.draw_temporary_connection(screen)
         else:
             self.draw_normal_connection(screen)
-        
-        # Рисуем частицы
-        for particle in self.particles:
-            alpha = int(255 * particle['life'])
-            p_color = (*particle['color'][:3], alpha)
-            s = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, p_color, (particle['size'], particle['size']), particle['size'])
-            screen.blit(s, (particle['x'] - particle['size'], particle['y'] - particle['size']))
     
     def draw_normal_connection(self, screen):
         """Обычная связь с легким свечением"""
@@ -125,15 +120,13 @@ class Connection:
         for i in range(2):
             glow_width = self.width + 2 + i * 2
             alpha = 50 - i * 20
-            s = pygame.Surface((900, 700), pygame.SRCALPHA)
-            pygame.draw.line(s, (*self.color, alpha), 
-                           (self.node1.x, self.node1.y), 
-                           (self.node2.x, self.node2.y), 
-                           int(glow_width))
-            screen.blit(s, (0, 0))
+            draw_alpha_line(screen, (*self.color, alpha),
+                            (self.node1.x, self.node1.y),
+                            (self.node2.x, self.node2.y),
+                            int(glow_width))
         
         # Основная линия
-        pygame.draw.line(screen, self.color, 
+        draw_solid_line(screen, self.color, 
                         (self.node1.x, self.node1.y), 
                         (self.node2.x, self.node2.y), 
                         self.width)
@@ -149,9 +142,7 @@ class Connection:
         for i in range(3):
             radius = 5 + i * 3
             alpha = int(200 / (i + 1))
-            s = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*self.color, alpha), (radius, radius), radius)
-            screen.blit(s, (pulse_x - radius, pulse_y - radius))
+            blit_circle(screen, (pulse_x, pulse_y), radius, self.color, alpha)
         
         # Основная линия с градиентом
         self.draw_gradient_line(screen, self.node1, self.node2, self.color, self.width)
@@ -169,9 +160,8 @@ class Connection:
             mid_y = (self.node1.y + self.node2.y) / 2
             
             # Фон для текста
-            font = pygame.font.Font(None, 16)
             time_text = f"{int(time_left)}s"
-            text_surf = font.render(time_text, True, (255, 255, 255))
+            text_surf = render_text(time_text, 16, (255, 255, 255))
             text_rect = text_surf.get_rect(center=(mid_x, mid_y))
             
             # Фон
@@ -185,7 +175,7 @@ class Connection:
         """Рисует пунктирную линию"""
         dx = node2.x - node1.x
         dy = node2.y - node1.y
-        distance = math.sqrt(dx*dx + dy*dy)
+        distance = self.distance
         
         if distance == 0:
             return
@@ -211,7 +201,7 @@ class Connection:
     def draw_gradient_line(self, screen, node1, node2, color, width):
         """Рисует линию с градиентом"""
         # Упрощенная версия - просто яркая линия
-        pygame.draw.line(screen, color, 
+        draw_solid_line(screen, color, 
                         (node1.x, node1.y), 
                         (node2.x, node2.y), 
                         width)
@@ -220,9 +210,7 @@ class Connection:
         for i in range(2):
             glow_width = width + 2 + i
             alpha = 80 - i * 30
-            s = pygame.Surface((900, 700), pygame.SRCALPHA)
-            pygame.draw.line(s, (*color, alpha), 
-                           (node1.x, node1.y), 
-                           (node2.x, node2.y), 
-                           int(glow_width))
-            screen.blit(s, (0, 0))
\ No newline at end of file
+            draw_alpha_line(screen, (*color, alpha),
+                            (node1.x, node1.y),
+                            (node2.x, node2.y),
+                            int(glow_width))
\ No newline at end of file
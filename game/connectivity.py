@@ -0,0 +1,74 @@
+from .traversal import is_passable
+
+
+class ConnectivityTracker:
+    """Инкрементально поддерживает множество узлов, достижимых из старта.
+    
+    Добавление связи и снятие заражения только расширяют множество,
+    поэтому обрабатываются обходом новой части графа. Удаление связи
+    или заражение достижимого узла может разорвать путь - тогда
+    множество помечается устаревшим и пересчитывается при следующем
+    запросе. Пока граф не меняется, запрос выполняется за O(1).
+    """
+    
+    def __init__(self, connection_manager):
+        self.connection_manager = connection_manager
+        self.source = None
+        self.reachable = set()
+        self.dirty = True
+        
+    def reset(self, source):
+        self.source = source
+        self.reachable = set()
+        self.dirty = True
+        
+    @staticmethod
+    def is_blocked(node):
+        return not is_passable(node)
+    
+    def is_reachable(self, node):
+        """Есть ли путь от источника до узла по активным связям"""
+        if self.source is None:
+            return False
+        if self.dirty:
+            self._recompute()
+        return node in self.reachable
+    
+    def _recompute(self):
+        self.reachable = set()
+        self.dirty = False
+        if self.source is not None:
+            self._expand_from(self.source)
+            
+    def _expand_from(self, node):
+        """Добавляет узел и все, что достижимо через него"""
+        # Зараженный узел сам достижим, но обход через него не идет
+        traversal = self.connection_manager.traversal
+        self.reachable.update(traversal.bfs_order((node,), exclude=self.reachable))
+                    
+    def on_connection_added(self, connection):
+        if self.dirty:
+            return
+        node1, node2 = connection.node1, connection.node2
+        if node1 in self.reachable and node2 not in self.reachable:
+            if not self.is_blocked(node1):
+                self._expand_from(node2)
+        elif node2 in self.reachable and node1 not in self.reachable:
+            if not self.is_blocked(node2):
+                self._expand_from(node1)
+                
+    def on_connection_removed(self, connection):
+        if self.dirty:
+            return
+        if connection.node1 in self.reachable and connection.node2 in self.reachable:
+            self.dirty = True
+            
+    def on_node_type_changed(self, node, old_type, new_type):
+        if self.dirty or node not in self.reachable:
+            return
+        was_blocked = old_type == "virus"
+        blocked = new_type == "virus"
+        if blocked and not was_blocked:
+            self.dirty = True
+        elif was_blocked and not blocked:
+            self._expand_from(node)
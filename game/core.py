@@ -1,12 +1,16 @@
 import pygame
-import random
 import math
 from .node import Node
-from .connection import Connection
-from .levels import get_level
+from .connection import Connection, draw_alpha_line
+from .sprites import blit_circle
 from .silence import Silence
 from .virus import Virus
-from .agent import Agent
+from .sim import FIXED_DT, GameState, Simulation
+from .sim.planner import RoutePlanner
+from .text import render_text
+from .particles import particle_system, LAYER_LINKS, LAYER_EFFECTS
+from .dirty import DirtyRegions
+from .levels import get_level_numbers, get_next_level
 
 # Константы
 SCREEN_WIDTH = 1200
@@ -14,62 +18,46 @@ SCREEN_HEIGHT = 700
 GAME_AREA_WIDTH = 900
 PANEL_WIDTH = 300
 FPS = 60
-
-class GameState:
-    PLAYING = "playing"
-    WIN = "win"
-    LOSE = "lose"
-
-class LevelManager:
-    def __init__(self, agent):
-        self.agent = agent
-        self.current_level = 1
-        self.nodes = []
-        self.connections = []
-        self.viruses = []
-        self.player_energy = 0
-        self.level_config = None
-        
-    def load_level(self, level_num):
-        try:
-            self.level_config = get_level(level_num)
-            self.current_level = level_num
-        except Exception as e:
-            print(f"Ошибка загрузки уровня {level_num}: {e}")
-            self.level_config = get_level(1)
-            self.current_level = 1
-            
-        self.nodes = []
-        for node_data in self.level_config["nodes"]:
-            self.nodes.append(Node(**node_data))
-            
-        self.player_energy = self.level_config["start_energy"]
-        self.connections = []
-        self.viruses = []
-        
-        # Инициализируем вирусы
-        for node in self.nodes:
-            if node.type == "virus":
-                self.viruses.append(Virus(node))
-                
-        return self.level_config
+# Симуляция всегда шагает на фиксированный dt (FIXED_DT), независимо от частоты кадров
+# Если отрисовка отстала сильнее, лишнее время отбрасывается, а не догоняется
+MAX_STEPS_PER_FRAME = 5
+# Допустимые множители скорости симуляции: 0 - пауза
+TIME_SCALES = (0, 0.5, 1, 4, 16)
+# Сколько кадров подряд можно не рисовать, пока симуляция догоняет
+MAX_FRAME_SKIP = 4
+SMALL_FONT_SIZE = 18
+MEDIUM_FONT_SIZE = 22
+LARGE_FONT_SIZE = 28
+DIRTY_MARGIN = 4
+# Сколько мс держится подсказка маршрута (клавиша H)
+HINT_MS = 4000
+HINT_COLOR = (255, 255, 0)
 
 class UIManager:
-    def __init__(self, screen, font, title_font):
+    # Высоты строк блока статистики сверху вниз: агент, энергия, полоса энергии, слой
+    STATS_ROWS = (30, 25, 20, 25)
+    # Таймер и его полоса - только на уровнях с лимитом времени
+    TIMER_ROWS = (25, 25)
+    
+    def __init__(self, screen):
         self.screen = screen
-        self.font = font
-        self.title_font = title_font
-        self.small_font = pygame.font.Font(None, 18)
-        self.medium_font = pygame.font.Font(None, 22)
-        self.large_font = pygame.font.Font(None, 28)
         self.scroll_offset = 0
         self.max_scroll = 0
-        
-    def _draw_separator(self, x, y):
+        # Грязные области панели (DirtyRegions) в режиме частичной перерисовки
+        self.regions = None
+        # Слои панели: статичный (фон, сетка, управление) строится один раз,
+        # полустатичный (тексты уровня и способностей) - при смене panel_state
+        self.static_layer = None
+        self.panel_layer = None
+        self.panel_state = None
+        self.stats_y = 0
+        self.mode_line_y = None
+        
+    def _draw_separator(self, surface, x, y):
         """Рисует разделительную линию"""
-        pygame.draw.line(self.screen, (50, 50, 70), (x + 10, y), (x + 290, y), 1)
+        pygame.draw.line(surface, (50, 50, 70), (x + 10, y), (x + 290, y), 1)
         
-    def _draw_scrollable_description(self, panel_x, start_y, description):
+    def _draw_scrollable_description(self, surface, panel_x, start_y, description):
         """Рисует описание уровня с возможностью прокрутки"""
         max_height = 150
         line_height = 16
@@ -87,106 +75,119 @@ class UIManager:
         for line in visible_lines:
             if y_offset > 650:  # Не выходим за пределы экрана
                 break
-            desc_text = self.small_font.render(line, True, (200, 200, 200))
-            self.screen.blit(desc_text, (panel_x + 10, y_offset))
+            desc_text = render_text(line, SMALL_FONT_SIZE, (200, 200, 200))
+            surface.blit(desc_text, (panel_x + 10, y_offset))
             y_offset += line_height
             
         return len(visible_lines) * line_height
         
-    def _draw_stats(self, panel_x, y_offset, game_data):
+    def _draw_stats(self, surface, panel_x, y_offset, game_data):
         """Рисует статистику игры"""
         start_y = y_offset
+        rows = iter(self._stats_rows(game_data))
         
         # Агент с эффектом
-        agent_text = self.medium_font.render(">>> АГЕНТ 22 <<<", True, (0, 255, 255))
-        self.screen.blit(agent_text, (panel_x + 10, y_offset))
+        agent_text = render_text(">>> АГЕНТ 22 <<<", MEDIUM_FONT_SIZE, (0, 255, 255))
+        surface.blit(agent_text, (panel_x + 10, y_offset))
         
         # Индикатор активности
         pulse = abs(pygame.time.get_ticks() % 1000 - 500) / 500.0
         indicator_color = (0, int(255 * pulse), 255)
-        pygame.draw.circle(self.screen, indicator_color, (panel_x + 280, y_offset + 10), 5)
-        y_offset += 30
+        pygame.draw.circle(surface, indicator_color, (panel_x + 280, y_offset + 10), 5)
+        y_offset += next(rows)
         
         # Энергия с прогресс-баром
         energy_color = (255, 255, 255) if game_data["player_energy"] > 40 else (255, 200, 0) if game_data["player_energy"] > 20 else (255, 100, 100)
-        energy_text = self.medium_font.render(f"ЭНЕРГИЯ: {game_data['player_energy']}", True, energy_color)
-        self.screen.blit(energy_text, (panel_x + 10, y_offset))
-        y_offset += 25
+        energy_text = render_text(f"ЭНЕРГИЯ: {game_data['player_energy']}", MEDIUM_FONT_SIZE, energy_color)
+        surface.blit(energy_text, (panel_x + 10, y_offset))
+        y_offset += next(rows)
         
         # Прогресс-бар энергии
         max_energy = 150  # Примерное максимальное значение
         energy_ratio = min(1.0, game_data["player_energy"] / max_energy)
         bar_width = int(280 * energy_ratio)
-        pygame.draw.rect(self.screen, (50, 50, 50), (panel_x + 10, y_offset, 280, 12))
-        pygame.draw.rect(self.screen, energy_color, (panel_x + 10, y_offset, bar_width, 12))
-        pygame.draw.rect(self.screen, (100, 100, 100), (panel_x + 10, y_offset, 280, 12), 1)
-        y_offset += 20
+        pygame.draw.rect(surface, (50, 50, 50), (panel_x + 10, y_offset, 280, 12))
+        pygame.draw.rect(surface, energy_color, (panel_x + 10, y_offset, bar_width, 12))
+        pygame.draw.rect(surface, (100, 100, 100), (panel_x + 10, y_offset, 280, 12), 1)
+        y_offset += next(rows)
         
         # Уровень
-        level_text = self.medium_font.render(f"СЛОЙ: {game_data['current_level']}/10", True, (255, 255, 255))
-        self.screen.blit(level_text, (panel_x + 10, y_offset))
-        y_offset += 25
+        level_text = render_text(f"СЛОЙ: {game_data['current_level']}/{game_data['last_level']}", MEDIUM_FONT_SIZE, (255, 255, 255))
+        surface.blit(level_text, (panel_x + 10, y_offset))
+        
+        # Скорость симуляции, если она отличается от обычной
+        time_scale = game_data["time_scale"]
+        if time_scale != 1:
+            scale_label = "ПАУЗА" if time_scale == 0 else f"x{time_scale:g}"
+            scale_text = render_text(scale_label, MEDIUM_FONT_SIZE, (255, 200, 0))
+            surface.blit(scale_text, (panel_x + 290 - scale_text.get_width(), y_offset))
+        y_offset += next(rows)
         
         # Таймер уровня
         if game_data["level_time"] > 0:
             time_color = (255, 255, 255) if game_data["time_left"] > 30 else (255, 200, 0) if game_data["time_left"] > 10 else (255, 100, 100)
-            time_text = self.medium_font.render(f"ВРЕМЯ: {int(game_data['time_left'])}с", True, time_color)
-            self.screen.blit(time_text, (panel_x + 10, y_offset))
-            y_offset += 25
+            time_text = render_text(f"ВРЕМЯ: {int(game_data['time_left'])}с", MEDIUM_FONT_SIZE, time_color)
+            surface.blit(time_text, (panel_x + 10, y_offset))
+            y_offset += next(rows)
             
             # Прогресс-бар времени
             time_progress = max(0, game_data["time_left"] / game_data["level_time"])
-            pygame.draw.rect(self.screen, (50, 0, 0), (panel_x + 10, y_offset, 280, 12))
-            pygame.draw.rect(self.screen, time_color, (panel_x + 10, y_offset, 280 * time_progress, 12))
-            pygame.draw.rect(self.screen, (100, 100, 100), (panel_x + 10, y_offset, 280, 12), 1)
-            y_offset += 25
+            pygame.draw.rect(surface, (50, 0, 0), (panel_x + 10, y_offset, 280, 12))
+            pygame.draw.rect(surface, time_color, (panel_x + 10, y_offset, 280 * time_progress, 12))
+            pygame.draw.rect(surface, (100, 100, 100), (panel_x + 10, y_offset, 280, 12), 1)
+            y_offset += next(rows)
             
         return y_offset - start_y
         
-    def _draw_abilities(self, panel_x, y_offset, game_data):
+    def _draw_abilities(self, surface, panel_x, y_offset, game_data):
         """Рисует информацию о способностях"""
         start_y = y_offset
         
-        abilities_text = self.medium_font.render("Способности:", True, (100, 255, 100))
-        self.screen.blit(abilities_text, (panel_x + 10, y_offset))
+        abilities_text = render_text("Способности:", MEDIUM_FONT_SIZE, (100, 255, 100))
+        surface.blit(abilities_text, (panel_x + 10, y_offset))
         y_offset += 25
         
         if game_data["agent"].abilities["enhanced_connections"]:
-            ability_text = self.small_font.render("✓ УСИЛЕННЫЕ СВЯЗИ [E]", True, (100, 255, 100))
-            self.screen.blit(ability_text, (panel_x + 10, y_offset))
+            ability_text = render_text("✓ УСИЛЕННЫЕ СВЯЗИ [E]", SMALL_FONT_SIZE, (100, 255, 100))
+            surface.blit(ability_text, (panel_x + 10, y_offset))
             y_offset += 20
             
-            # Статус режима с эффектом
-            if game_data["enhanced_mode"]:
-                pulse = abs(pygame.time.get_ticks() % 500 - 250) / 250.0
-                mode_color = (int(0 + 200 * pulse), 200, 255)
-                mode_text = self.small_font.render(">>> РЕЖИМ: УСИЛЕННЫЕ <<<", True, mode_color)
-            else:
-                mode_text = self.small_font.render("РЕЖИМ: ОБЫЧНЫЕ", True, (0, 255, 0))
-            self.screen.blit(mode_text, (panel_x + 10, y_offset))
+            # Статус режима пульсирует - рисуется поверх слоев в _draw_mode_line
+            self.mode_line_y = y_offset
             y_offset += 25
         
         if game_data["agent"].abilities["antivirus"]:
-            antivirus_text = self.small_font.render("✓ АНТИВИРУС [Клик по вирусу]", True, (255, 100, 100))
-            self.screen.blit(antivirus_text, (panel_x + 10, y_offset))
+            antivirus_text = render_text("✓ АНТИВИРУС [Клик по вирусу]", SMALL_FONT_SIZE, (255, 100, 100))
+            surface.blit(antivirus_text, (panel_x + 10, y_offset))
             y_offset += 20
             
-            cost_text = self.small_font.render("Стоимость: 50 энергии", True, (200, 200, 200))
-            self.screen.blit(cost_text, (panel_x + 10, y_offset))
+            cost_text = render_text("Стоимость: 50 энергии", SMALL_FONT_SIZE, (200, 200, 200))
+            surface.blit(cost_text, (panel_x + 10, y_offset))
             y_offset += 20
             
-            isolation_text = self.small_font.render("Или изолируйте вирус", True, (150, 200, 255))
-            self.screen.blit(isolation_text, (panel_x + 10, y_offset))
+            isolation_text = render_text("Или изолируйте вирус", SMALL_FONT_SIZE, (150, 200, 255))
+            surface.blit(isolation_text, (panel_x + 10, y_offset))
             y_offset += 25
             
         return y_offset - start_y
         
-    def _draw_legend(self, panel_x, y_offset):
+    def _draw_mode_line(self, surface, panel_x, enhanced_mode):
+        """Рисует статус режима связей с эффектом"""
+        if enhanced_mode:
+            pulse = abs(pygame.time.get_ticks() % 500 - 250) / 250.0
+            mode_color = (int(0 + 200 * pulse), 200, 255)
+            mode_text = render_text(">>> РЕЖИМ: УСИЛЕННЫЕ <<<", SMALL_FONT_SIZE, mode_color)
+        else:
+            mode_text = render_text("РЕЖИМ: ОБЫЧНЫЕ", SMALL_FONT_SIZE, (0, 255, 0))
+        surface.blit(mode_text, (panel_x + 10, self.mode_line_y))
+        return mode_text.get_rect(topleft=(panel_x + 10, self.mode_line_y))
+        
+    def _draw_legend(self, surface, panel_x, y_offset):
         """Рисует легенду цветов узлов"""
         start_y = y_offset
         
-        legend_text = self.medium_font.render("ЛЕГЕНДА:", True, (255, 255, 255))
-        self.screen.blit(legend_text, (panel_x + 10, y_offset))
+        legend_text = render_text("ЛЕГЕНДА:", MEDIUM_FONT_SIZE, (255, 255, 255))
+        surface.blit(legend_text, (panel_x + 10, y_offset))
         y_offset += 25
         
         colors = [
@@ -201,18 +202,18 @@ class UIManager:
         ]
         
         for color_name, description in colors:
-            color_text = self.small_font.render(f"{color_name}: {description}", True, (200, 200, 200))
-            self.screen.blit(color_text, (panel_x + 10, y_offset))
+            color_text = render_text(f"{color_name}: {description}", SMALL_FONT_SIZE, (200, 200, 200))
+            surface.blit(color_text, (panel_x + 10, y_offset))
             y_offset += 18
             
         return y_offset - start_y
         
-    def _draw_costs(self, panel_x, y_offset):
+    def _draw_costs(self, surface, panel_x, y_offset):
         """Рисует стоимость связей"""
         start_y = y_offset
         
-        cost_text = self.medium_font.render("СТОИМОСТЬ СВЯЗЕЙ:", True, (255, 255, 255))
-        self.screen.blit(cost_text, (panel_x + 10, y_offset))
+        cost_text = render_text("СТОИМОСТЬ СВЯЗЕЙ:", MEDIUM_FONT_SIZE, (255, 255, 255))
+        surface.blit(cost_text, (panel_x + 10, y_offset))
         y_offset += 25
         
         costs = [
@@ -222,109 +223,159 @@ class UIManager:
         ]
         
         for connection_type, cost in costs:
-            cost_text = self.small_font.render(f"{connection_type}: {cost}", True, (200, 200, 200))
-            self.screen.blit(cost_text, (panel_x + 10, y_offset))
+            cost_text = render_text(f"{connection_type}: {cost}", SMALL_FONT_SIZE, (200, 200, 200))
+            surface.blit(cost_text, (panel_x + 10, y_offset))
             y_offset += 18
             
         return y_offset - start_y
         
-    def _draw_controls(self, panel_x):
+    def _draw_controls(self, surface, panel_x):
         """Рисует управление внизу панели"""
         controls = [
             "УПРАВЛЕНИЕ:",
             "ЛКМ - создать связь",
             "ЛКМ по вирусу - уничтожить",
-            "E - усиленные связи", 
-            "R - перезапуск",
+            "E - усиленные связи, H - подсказка",
+            "R - перезапуск, [ ] - скорость",
             "N - следующий уровень"
         ]
         
         y_start = SCREEN_HEIGHT - len(controls) * 20 - 10
         for i, control in enumerate(controls):
             color = (0, 255, 255) if i == 0 else (150, 200, 255)
-            control_text = self.small_font.render(control, True, color)
-            self.screen.blit(control_text, (panel_x + 10, y_start + i * 18))
+            control_text = render_text(control, SMALL_FONT_SIZE, color)
+            surface.blit(control_text, (panel_x + 10, y_start + i * 18))
     
-    def _draw_scan_lines(self, panel_x):
+    def _draw_scan_lines(self, surface, panel_x):
         """Рисует сканирующие линии в киберпространственном стиле"""
         import math
         scan_y = int((pygame.time.get_ticks() / 50) % SCREEN_HEIGHT)
         s = pygame.Surface((PANEL_WIDTH, 2), pygame.SRCALPHA)
         s.fill((0, 255, 255, 100))
-        self.screen.blit(s, (panel_x, scan_y))
+        surface.blit(s, (panel_x, scan_y))
+        self._mark_dirty((panel_x, scan_y, PANEL_WIDTH, 2))
     
-    def _draw_terminal_grid(self, panel_x):
+    def _mark_dirty(self, rect):
+        if self.regions is not None:
+            self.regions.add(rect)
+    
+    def _draw_terminal_grid(self, surface, panel_x):
         """Рисует сетку в терминальном стиле"""
         grid_color = (0, 50, 50)
         for y in range(0, SCREEN_HEIGHT, 20):
-            pygame.draw.line(self.screen, grid_color, (panel_x, y), (panel_x + PANEL_WIDTH, y), 1)
-        for x in range(panel_x, SCREEN_WIDTH, 30):
-            pygame.draw.line(self.screen, grid_color, (x, 0), (x, SCREEN_HEIGHT), 1)
+            pygame.draw.line(surface, grid_color, (panel_x, y), (panel_x + PANEL_WIDTH, y), 1)
+        for x in range(panel_x, panel_x + PANEL_WIDTH, 30):
+            pygame.draw.line(surface, grid_color, (x, 0), (x, SCREEN_HEIGHT), 1)
         
-    def draw_panel(self, game_data):
-        """Отрисовывает правую панель UI в киберпространственном стиле"""
-        panel_x = GAME_AREA_WIDTH
-        y_offset = 20
+    def _build_static_layer(self):
+        """Фон, свечение границы и сетка - не меняются никогда"""
+        layer = pygame.Surface((PANEL_WIDTH, SCREEN_HEIGHT))
         
         # Фон панели с градиентом
-        pygame.draw.rect(self.screen, (10, 10, 25), (panel_x, 0, PANEL_WIDTH, SCREEN_HEIGHT))
-        
-        # Сканирующие линии
-        self._draw_scan_lines(panel_x)
+        layer.fill((10, 10, 25))
         
         # Граница с эффектом свечения
         for i in range(3):
             alpha = 100 - i * 30
             s = pygame.Surface((2, SCREEN_HEIGHT), pygame.SRCALPHA)
             s.fill((0, 255, 255, alpha))
-            self.screen.blit(s, (panel_x + i, 0))
+            layer.blit(s, (i, 0))
         
         # Терминальный стиль - сетка
-        self._draw_terminal_grid(panel_x)
+        self._draw_terminal_grid(layer, 0)
+        return layer
+        
+    def _build_panel_layer(self, game_data):
+        """Тексты уровня, способностей, легенда, стоимость и управление поверх статичного слоя.
+        Запоминает, где рисовать динамические блоки."""
+        if self.static_layer is None:
+            self.static_layer = self._build_static_layer()
+        layer = self.static_layer.copy()
+        y_offset = 20
         
         # Название уровня
-        title_text = self.large_font.render(game_data["level_name"], True, (255, 255, 255))
-        self.screen.blit(title_text, (panel_x + 10, y_offset))
+        title_text = render_text(game_data["level_name"], LARGE_FONT_SIZE, (255, 255, 255))
+        layer.blit(title_text, (10, y_offset))
         y_offset += 40
         
         # Описание уровня
-        desc_height = self._draw_scrollable_description(panel_x, y_offset, game_data["level_description"])
+        desc_height = self._draw_scrollable_description(layer, 0, y_offset, game_data["level_description"])
         y_offset += desc_height + 20
         
         # Разделитель
-        self._draw_separator(panel_x, y_offset)
+        self._draw_separator(layer, 0, y_offset)
         y_offset += 20
         
-        # Статистика
-        stats_height = self._draw_stats(panel_x, y_offset, game_data)
-        y_offset += stats_height + 10
+        # Статистика рисуется каждый кадр, здесь только оставляем под нее место
+        self.stats_y = y_offset
+        y_offset += self._stats_height(game_data) + 10
         
         # Разделитель
-        self._draw_separator(panel_x, y_offset)
+        self._draw_separator(layer, 0, y_offset)
         y_offset += 20
         
         # Способности
-        abilities_height = self._draw_abilities(panel_x, y_offset, game_data)
+        self.mode_line_y = None
+        abilities_height = self._draw_abilities(layer, 0, y_offset, game_data)
         y_offset += abilities_height + 10
         
         # Разделитель
-        self._draw_separator(panel_x, y_offset)
+        self._draw_separator(layer, 0, y_offset)
         y_offset += 20
         
         # Легенда
-        legend_height = self._draw_legend(panel_x, y_offset)
+        legend_height = self._draw_legend(layer, 0, y_offset)
         y_offset += legend_height + 10
         
         # Разделитель
-        self._draw_separator(panel_x, y_offset)
+        self._draw_separator(layer, 0, y_offset)
         y_offset += 20
         
         # Стоимость связей
-        costs_height = self._draw_costs(panel_x, y_offset)
-        y_offset += costs_height
+        self._draw_costs(layer, 0, y_offset)
+        
+        # Управление (всегда внизу, поверх длинных описаний)
+        self._draw_controls(layer, 0)
+        return layer
+        
+    @classmethod
+    def _stats_rows(cls, game_data):
+        """Высоты строк, которые _draw_stats рисует для этого уровня"""
+        if game_data["level_time"] > 0:
+            return cls.STATS_ROWS + cls.TIMER_ROWS
+        return cls.STATS_ROWS
+        
+    @classmethod
+    def _stats_height(cls, game_data):
+        """Высота блока статистики - по тем же строкам, что рисует _draw_stats"""
+        return sum(cls._stats_rows(game_data))
+        
+    def draw_panel(self, game_data):
+        """Отрисовывает правую панель UI в киберпространственном стиле"""
+        panel_x = GAME_AREA_WIDTH
         
-        # Управление (всегда внизу)
-        self._draw_controls(panel_x)
+        # Смена уровня, режима или способностей меняет раскладку всей панели
+        panel_state = (game_data["level_name"], game_data["level_description"],
+                       game_data["current_level"], game_data["level_time"] > 0,
+                       tuple(game_data["agent"].abilities.items()))
+        if panel_state != self.panel_state or self.panel_layer is None:
+            self.panel_state = panel_state
+            self.panel_layer = self._build_panel_layer(game_data)
+            if self.regions is not None:
+                self.regions.invalidate()
+        self.screen.blit(self.panel_layer, (panel_x, 0))
+        
+        # Статистика: энергия, таймер и индикатор активности меняются постоянно
+        stats_height = self._draw_stats(self.screen, panel_x, self.stats_y, game_data)
+        self._mark_dirty((panel_x, self.stats_y, PANEL_WIDTH, stats_height))
+        
+        # Статус режима
+        if self.mode_line_y is not None:
+            mode_rect = self._draw_mode_line(self.screen, panel_x, game_data["enhanced_mode"])
+            self._mark_dirty((panel_x, self.mode_line_y, PANEL_WIDTH, mode_rect.height))
+        
+        # Сканирующие линии поверх всех слоев
+        self._draw_scan_lines(self.screen, panel_x)
         
     def draw_game_state_message(self, game_state, time_left, stars=0):
         """Отрисовывает сообщения о победе/поражении"""
@@ -333,12 +384,12 @@ class UIManager:
         self.screen.blit(overlay, (0, 0))
         
         if game_state == GameState.WIN:
-            win_text = self.large_font.render("СЛОЙ СТАБИЛИЗИРОВАН!", True, (0, 255, 0))
+            win_text = render_text("СЛОЙ СТАБИЛИЗИРОВАН!", LARGE_FONT_SIZE, (0, 255, 0))
             text_rect = win_text.get_rect(center=(GAME_AREA_WIDTH//2, SCREEN_HEIGHT//2 - 80))
             self.screen.blit(win_text, text_rect)
             
             # Рисуем звезды
-            stars_text = self.medium_font.render(f"ЗВЕЗД ЗАРАБОТАНО: {stars}/5", True, (255, 215, 0))
+            stars_text = render_text(f"ЗВЕЗД ЗАРАБОТАНО: {stars}/5", MEDIUM_FONT_SIZE, (255, 215, 0))
             stars_rect = stars_text.get_rect(center=(GAME_AREA_WIDTH//2, SCREEN_HEIGHT//2 - 30))
             self.screen.blit(stars_text, stars_rect)
             
@@ -356,17 +407,17 @@ class UIManager:
                     # Серая звезда
                     self._draw_star(self.screen, x, y, star_size, (100, 100, 100))
             
-            next_text = self.medium_font.render("Нажмите N для следующего уровня", True, (200, 255, 200))
+            next_text = render_text("Нажмите N для следующего уровня", MEDIUM_FONT_SIZE, (200, 255, 200))
             next_rect = next_text.get_rect(center=(GAME_AREA_WIDTH//2, SCREEN_HEIGHT//2 + 60))
             self.screen.blit(next_text, next_rect)
             
         elif game_state == GameState.LOSE:
             if time_left <= 0:
-                lose_text = self.large_font.render("ВРЕМЯ ВЫШЛО!", True, (255, 0, 0))
+                lose_text = render_text("ВРЕМЯ ВЫШЛО!", LARGE_FONT_SIZE, (255, 0, 0))
             else:
-                lose_text = self.large_font.render("СИСТЕМА ЗАРАЖЕНА!", True, (255, 0, 0))
+                lose_text = render_text("СИСТЕМА ЗАРАЖЕНА!", LARGE_FONT_SIZE, (255, 0, 0))
                 
-            restart_text = self.medium_font.render("Нажмите R для перезапуска", True, (255, 200, 200))
+            restart_text = render_text("Нажмите R для перезапуска", MEDIUM_FONT_SIZE, (255, 200, 200))
             
             text_rect = lose_text.get_rect(center=(GAME_AREA_WIDTH//2, SCREEN_HEIGHT//2 - 20))
             restart_rect = restart_text.get_rect(center=(GAME_AREA_WIDTH//2, SCREEN_HEIGHT//2 + 20))
@@ -391,181 +442,84 @@ class UIManager:
             points.append((px, py))
         pygame.draw.polygon(screen, color, points)
 
-class ConnectionManager:
-    def __init__(self):
-        self.connections = []
-        
-    def connection_exists(self, node1, node2):
-        for conn in self.connections:
-            if (conn.node1 == node1 and conn.node2 == node2) or (conn.node1 == node2 and conn.node2 == node1):
-                return True
-        return False
-        
-    def create_connection(self, node1, node2, connection_type, agent, player_energy, max_length=250, duration=None):
-        """Создает соединение и возвращает новую энергию"""
-        # Проверяем расстояние
-        distance = ((node1.x - node2.x) ** 2 + (node1.y - node2.y) ** 2) ** 0.5
-        if distance > max_length:  # Используем переданный параметр
-            return player_energy, "Слишком длинная связь! Макс: {}px".format(max_length)
-            
-        # Запрещаем прямое соединение старта и финиша
-        if (node1.type == "start" and node2.type == "finish") or (node1.type == "finish" and node2.type == "start"):
-            return player_energy, "Нельзя соединять старт и финиш напрямую!"
-        
-        # Специальные правила для новых типов узлов
-        if node1.type == "firewall" or node2.type == "firewall":
-            # Firewall блокирует вирусы, но стоит дороже
-            if connection_type == "normal":
-                connection_type = "firewall"
-        
-        # Amplifier снижает стоимость связей на 30%
-        cost_multiplier = 1.0
-        if node1.type == "amplifier" or node2.type == "amplifier":
-            cost_multiplier = 0.7
-            
-        cost = int(agent.get_connection_cost(connection_type) * cost_multiplier)
-        
-        if player_energy >= cost and not self.connection_exists(node1, node2):
-            self.connections.append(Connection(node1, node2, connection_type, duration))
-            return player_energy - cost, "Связь создана!"
-        
-        return player_energy, "Недостаточно энергии или связь уже существует"
-    
-    def update_connections(self, dt):
-        """Обновляет все связи (анимации, временные связи)"""
-        connections_to_remove = []
-        for connection in self.connections:
-            connection.update(dt)
-            if connection.is_expired():
-                connections_to_remove.append(connection)
-        
-        for conn in connections_to_remove:
-            self.connections.remove(conn)
-    
-    def check_connection(self, start, finish):
-        """Проверяет существование пути от start до finish"""
-        visited = set()
-        return self._dfs_connection(start, finish, visited)
+class GameSimulation(Simulation):
+    """Симуляция с объектами, которые умеют себя рисовать"""
     
-    def find_all_paths(self, start, finish):
-        """Находит все возможные пути от start до finish"""
-        paths = []
-        visited = set()
-        self._dfs_all_paths(start, finish, visited, [], paths)
-        return paths
+    node_class = Node
+    connection_class = Connection
+    virus_class = Virus
+    silence_class = Silence
     
-    def _dfs_all_paths(self, current, finish, visited, path, all_paths):
-        if current == finish:
-            all_paths.append(path[:])
-            return
-        
-        if current.type == "virus" or current in visited:
-            return
-        
-        visited.add(current)
-        path.append(current)
-        
-        for connection in self.connections:
-            if connection.is_expired():
-                continue
-            node1, node2 = connection.node1, connection.node2
-            if node1 == current and node2 not in visited:
-                self._dfs_all_paths(node2, finish, visited, path, all_paths)
-            elif node2 == current and node1 not in visited:
-                self._dfs_all_paths(node1, finish, visited, path, all_paths)
-        
-        path.pop()
-        visited.remove(current)
-        
-    def _dfs_connection(self, current, finish, visited):
-        if current == finish:
-            return True
-            
-        if current.type == "virus" or current in visited:
-            return False
-            
-        visited.add(current)
-        
-        for connection in self.connections:
-            if connection.is_expired():
-                continue
-            node1, node2 = connection.node1, connection.node2
-            if node1 == current and node2 not in visited:
-                if self._dfs_connection(node2, finish, visited):
-                    return True
-            elif node2 == current and node1 not in visited:
-                if self._dfs_connection(node1, finish, visited):
-                    return True
-                    
-        return False
+    def create_virus_destruction_effect(self, node):
+        """Создает визуальный эффект уничтожения вируса"""
+        # Создаем частицы для эффекта уничтожения
+        angles = [self.rng.effects.uniform(0, 2 * math.pi) for i in range(30)]
+        speeds = [self.rng.effects.uniform(2, 5) for i in range(30)]
+        particle_system.emit(
+            node.x, node.y,
+            vx=[math.cos(angle) * speed for angle, speed in zip(angles, speeds)],
+            vy=[math.sin(angle) * speed for angle, speed in zip(angles, speeds)],
+            size=[self.rng.effects.randint(3, 6) for i in range(30)],
+            color=(255, 200, 0), decay=2.0, shrink=0.98, layer=LAYER_EFFECTS
+        )
 
 class Game:
-    def __init__(self):
+    def __init__(self, dirty_rects=False, seed=None):
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Синапсис - Агент 22")
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 24)
-        self.title_font = pygame.font.Font(None, 32)
         
-        # Инициализация систем
-        self.agent = Agent()
-        self.silence = Silence()
-        self.level_manager = LevelManager(self.agent)
-        self.connection_manager = ConnectionManager()
-        self.ui_manager = UIManager(self.screen, self.font, self.title_font)
+        # Вся игровая логика - в симуляции, Game только рисует и принимает ввод
+        self.sim = GameSimulation(seed)
+        # Накопленное реальное время, еще не отданное симуляции
+        self.accumulator = 0.0
+        # Множитель скорости симуляции (один из TIME_SCALES)
+        self.time_scale = 1
+        # Пропуск отрисовки, пока симуляция догоняет ускоренное время
+        self.skip_draw = False
+        self.skipped_frames = 0
+        self.ui_manager = UIManager(self.screen)
+        
+        # Игровая область рисуется в постоянную поверхность
+        self.game_surface = pygame.Surface((GAME_AREA_WIDTH, SCREEN_HEIGHT))
+        # Режим частичной перерисовки: только изменившиеся области экрана
+        self.dirty_rects = dirty_rects
+        self.scene_regions = DirtyRegions((0, 0, GAME_AREA_WIDTH, SCREEN_HEIGHT))
+        self.drawn_connections = set()
+        if dirty_rects:
+            self.ui_manager.regions = DirtyRegions((GAME_AREA_WIDTH, 0, PANEL_WIDTH, SCREEN_HEIGHT))
         
         self.enhanced_mode = False
         self.selected_node = None
         self.hover_node = None
-        self.game_state = GameState.PLAYING
-        self.stars_earned = 0
-        self.destruction_effects = []  # Эффекты уничтожения вирусов
-        
-        # Таймер уровня
-        self.level_time = 0
-        self.time_left = 0
         self.level_start_time = 0
         
+        # Подсказка: самый дешевый маршрут до финиша, показывается HINT_MS
+        self.planner = RoutePlanner(self.sim)
+        self.hint = None
+        self.hint_until = 0
+        self.drawn_hint = ((), ())
+        
         self.load_level(1)
         
     def load_level(self, level_num):
-        level_config = self.level_manager.load_level(level_num)
-        self.connection_manager.connections = self.level_manager.connections
-        self.player_energy = self.level_manager.player_energy
-        
-        # Настройка уровня
-        self.level_name = level_config.get("name", f"Уровень {level_num}")
-        self.level_description = level_config.get("description", "")
-        
-        # Настройка времени уровня
-        self.level_time = level_config.get("time_limit", 0)
-        self.time_left = self.level_time
+        # Частицы прошлого уровня больше не нужны
+        particle_system.clear()
+        self.sim.load_level(level_num)
         self.level_start_time = pygame.time.get_ticks()
         
-        # Настройка волн Тишины
-        if level_config.get("waves", False):
-            self.silence.speed = level_config.get("silence_speed", 0.001)
-            self.silence.wave_interval = level_config.get("wave_interval", 30000)
-        else:
-            self.silence.speed = 0
-            
-        # Разблокировка способностей в зависимости от уровня
-        if level_num >= 4:
-            self.agent.unlock_ability("enhanced_connections")
-        if level_num >= 6:
-            self.agent.unlock_ability("antivirus")
-            
         self.selected_node = None
         self.hover_node = None
-        self.game_state = GameState.PLAYING
+        self.hint = None
+        self.scene_regions.invalidate()
     
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return False
                 
-            if event.type == pygame.MOUSEBUTTONDOWN and self.game_state == GameState.PLAYING:
+            if event.type == pygame.MOUSEBUTTONDOWN and self.sim.game_state == GameState.PLAYING:
                 if event.pos[0] < GAME_AREA_WIDTH:
                     self.handle_click(event.pos)
                     
@@ -574,324 +528,276 @@ class Game:
                 
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
-                    self.load_level(self.level_manager.current_level)
-                elif event.key == pygame.K_n and self.game_state == GameState.WIN:
-                    self.current_level = min(10, self.level_manager.current_level + 1)
+                    self.load_level(self.sim.level_manager.current_level)
+                elif event.key == pygame.K_n and self.sim.game_state == GameState.WIN:
+                    self.current_level = get_next_level(self.sim.level_manager.current_level)
                     self.load_level(self.current_level)
-                elif event.key == pygame.K_e and self.agent.can_use_enhanced_connections():
+                elif event.key == pygame.K_e and self.sim.agent.can_use_enhanced_connections():
                     self.enhanced_mode = not self.enhanced_mode
+                elif event.key == pygame.K_h and self.sim.game_state == GameState.PLAYING:
+                    self.show_hint()
+                elif event.key == pygame.K_LEFTBRACKET:
+                    self.change_time_scale(-1)
+                elif event.key == pygame.K_RIGHTBRACKET:
+                    self.change_time_scale(1)
         
         return True
 
     def handle_hover(self, pos):
         """Обработка наведения мыши на узлы"""
         if pos[0] < GAME_AREA_WIDTH:
-            self.hover_node = None
-            for node in self.level_manager.nodes:
-                if node.is_clicked(pos):
-                    self.hover_node = node
-                    break
+            self.hover_node = self.sim.level_manager.node_at(pos)
 
     def handle_click(self, pos):
         """Обработка кликов по узлам"""
-        for node in self.level_manager.nodes:
-            if node.is_clicked(pos):
-                # Попытка уничтожить вирус при клике
-                if node.type == "virus":
-                    if self.destroy_virus(node):
-                        # Вирус уничтожен, сбрасываем выделение
-                        if self.selected_node:
-                            self.selected_node.selected = False
-                            self.selected_node = None
-                    return
-                    
-                if self.selected_node is None:
-                    self.selected_node = node
-                    node.selected = True
-                else:
-                    if node != self.selected_node:
-                        self.create_connection(self.selected_node, node)
+        node = self.sim.level_manager.node_at(pos)
+        if node is None:
+            return
+        
+        # Попытка уничтожить вирус при клике
+        if node.type == "virus":
+            if self.sim.destroy_virus(node):
+                # Вирус уничтожен, сбрасываем выделение
+                if self.selected_node:
                     self.selected_node.selected = False
                     self.selected_node = None
-                break
-
-    def create_connection(self, node1, node2):
-        """Создание соединения между узлами"""
-        if node1.type == "virus" or node2.type == "virus":
             return
-        
-        # Определяем тип связи
-        # Если уровень поддерживает временные связи, используем их по умолчанию
-        if self.level_manager.level_config.get("temporary_connections", False):
-            connection_type = "temporary"
-            duration = self.level_manager.level_config.get("temporary_duration", 10.0)
+            
+        if self.selected_node is None:
+            self.selected_node = node
+            node.selected = True
         else:
-            connection_type = "enhanced" if self.enhanced_mode else "normal"
-            duration = None
-        
-        # Получаем максимальную длину соединения для текущего уровня
-        max_length = self.level_manager.level_config.get("max_connection_length", 250)
-    
-        new_energy, message = self.connection_manager.create_connection(
-            node1, node2, connection_type, self.agent, self.player_energy, max_length, duration
-        )   
-        
-        if new_energy != self.player_energy:  # Если соединение создано
-            self.player_energy = new_energy
+            if node != self.selected_node:
+                self.sim.create_connection(self.selected_node, node, self.enhanced_mode)
+            self.selected_node.selected = False
+            self.selected_node = None
 
-    def destroy_virus(self, virus_node):
-        """Игрок может уничтожить вирус"""
-        # Способ 1: Изоляция (все связи разорваны)
-        if self.is_isolated(virus_node):
-            # Удаляем вирус из списка вирусов
-            virus_to_remove = None
-            for virus in self.level_manager.viruses:
-                if virus.node == virus_node:
-                    virus_to_remove = virus
-                    break
-            
-            if virus_to_remove:
-                self.level_manager.viruses.remove(virus_to_remove)
-            
-            # Меняем тип узла на нейтральный
-            virus_node.type = "neutral"
-            
-            # Визуальный эффект уничтожения
-            self.create_virus_destruction_effect(virus_node)
-            return True
-        
-        # Способ 2: Антивирусная атака (дорогая способность)
-        if self.agent.can_use_antivirus() and self.player_energy >= 50:
-            # Удаляем вирус из списка вирусов
-            virus_to_remove = None
-            for virus in self.level_manager.viruses:
-                if virus.node == virus_node:
-                    virus_to_remove = virus
-                    break
-            
-            if virus_to_remove:
-                self.level_manager.viruses.remove(virus_to_remove)
-            
-            virus_node.type = "neutral"
-            self.player_energy -= 50
-            
-            # Визуальный эффект уничтожения
-            self.create_virus_destruction_effect(virus_node)
-            return True
-        
-        return False
-    
-    def is_isolated(self, node):
-        """Проверяет изолирован ли узел от основной сети"""
-        # Узел изолирован если не соединен со стартом через активные связи
-        start_node = next((n for n in self.level_manager.nodes if n.type == "start"), None)
-        if start_node:
-            # Проверяем изоляцию: нет активных связей с другими узлами
-            has_connections = False
-            for connection in self.connection_manager.connections:
-                if connection.is_expired():
-                    continue
-                if (connection.node1 == node and connection.node2 != node) or \
-                   (connection.node2 == node and connection.node1 != node):
-                    has_connections = True
-                    break
-            
-            # Если есть связи, проверяем, соединен ли со стартом
-            if has_connections:
-                return not self.connection_manager.check_connection(start_node, node)
-            else:
-                # Нет связей вообще - изолирован
-                return True
-        return True
-    
-    def create_virus_destruction_effect(self, node):
-        """Создает визуальный эффект уничтожения вируса"""
-        import random
-        import math
-        
-        # Создаем частицы для эффекта уничтожения
-        for i in range(30):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            self.destruction_effects.append({
-                'x': node.x,
-                'y': node.y,
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'color': (255, 200, 0),
-                'size': random.randint(3, 6),
-                'life': 1.0,
-                'max_life': 1.0
-            })
-    
-    def check_victory(self):
-        """Проверка условий победы"""
-        start_node = next((n for n in self.level_manager.nodes if n.type == "start"), None)
-        finish_node = next((n for n in self.level_manager.nodes if n.type == "finish"), None)
-        
-        if not start_node or not finish_node:
-            return False
-        
-        return self.connection_manager.check_connection(start_node, finish_node)
-    
-    def calculate_stars(self):
-        """Вычисляет количество звезд за уровень"""
-        stars = 0
-        level_config = self.level_manager.level_config
-        
-        # Звезда 1: Основная победа
-        if self.check_victory():
-            stars += 1
-        
-        # Звезда 2: Время (если есть лимит)
-        if level_config.get("time_limit", 0) > 0:
-            time_bonus = level_config.get("time_bonus", 0.7)  # 70% времени осталось
-            if self.time_left / self.level_time >= time_bonus:
-                stars += 1
-        
-        # Звезда 3: Энергия
-        energy_bonus = level_config.get("energy_bonus", 0.3)  # 30% энергии осталось
-        if self.player_energy / self.level_manager.player_energy >= energy_bonus:
-            stars += 1
-        
-        # Звезда 4: Количество связей
-        max_connections = level_config.get("max_connections", None)
-        if max_connections and len(self.connection_manager.connections) <= max_connections:
-            stars += 1
-        
-        # Звезда 5: Резервный путь
-        start_node = next((n for n in self.level_manager.nodes if n.type == "start"), None)
-        finish_node = next((n for n in self.level_manager.nodes if n.type == "finish"), None)
-        if start_node and finish_node:
-            paths = self.connection_manager.find_all_paths(start_node, finish_node)
-            if len(paths) >= 2:  # Есть резервный путь
-                stars += 1
-        
-        return min(stars, 5)  # Максимум 5 звезд
+    def show_hint(self):
+        """Строит самый дешевый маршрут до финиша и показывает его; None - пути нет"""
+        self.hint = self.planner.plan(self.enhanced_mode)
+        self.hint_until = pygame.time.get_ticks() + HINT_MS
+        return self.hint
+        
+    def get_hint(self):
+        """Еще не построенные связи и вирусы подсказки, пока она видна"""
+        if self.hint is None or pygame.time.get_ticks() >= self.hint_until:
+            return (), ()
+        connection_manager = self.sim.connection_manager
+        links = tuple((a, b) for a, b in self.hint.links if not connection_manager.connection_exists(a, b))
+        cleared = tuple(node for node in self.hint.cleared if node.type == "virus")
+        return links, cleared
+
+    def set_time_scale(self, time_scale):
+        """Задает скорость симуляции: 0 - пауза, 16 - в шестнадцать раз быстрее"""
+        if time_scale not in TIME_SCALES:
+            raise ValueError(f"Скорость должна быть одной из {TIME_SCALES}")
+        self.time_scale = time_scale
+        
+    def change_time_scale(self, step):
+        """Переключает скорость на step позиций в TIME_SCALES"""
+        index = TIME_SCALES.index(self.time_scale) + step
+        self.set_time_scale(TIME_SCALES[max(0, min(len(TIME_SCALES) - 1, index))])
 
     def update(self):
-        dt = self.clock.get_time()
-        
-        if self.game_state == GameState.PLAYING:
-            # Обновляем таймер уровня
-            if self.level_time > 0:
-                self.time_left -= dt / 1000.0
-                if self.time_left <= 0:
-                    self.game_state = GameState.LOSE
-                    return
-            
-            # Обновляем узлы
-            for node in self.level_manager.nodes:
-                node.update(dt)
-            
-            # Обновляем связи (анимации, временные связи)
-            self.connection_manager.update_connections(dt)
-            
-            # Обновляем эффекты уничтожения
-            for effect in self.destruction_effects[:]:
-                effect['life'] -= dt / 1000.0 * 2
-                effect['x'] += effect['vx'] * dt / 16.0
-                effect['y'] += effect['vy'] * dt / 16.0
-                effect['size'] *= 0.98
-                if effect['life'] <= 0:
-                    self.destruction_effects.remove(effect)
-            
-            # Обновляем системы
-            self.silence.update(self.connection_manager.connections, self.level_manager.nodes, dt)
-            
-            # Обновляем вирусы (только активные)
-            for virus in self.level_manager.viruses[:]:
-                # Проверяем, что вирус еще существует
-                if virus.node.type != "virus":
-                    self.level_manager.viruses.remove(virus)
-                    continue
-                virus.update(self.level_manager.nodes, self.connection_manager.connections, dt)
-            
-            # Проверяем поражение от вирусов
-            start_node = next((n for n in self.level_manager.nodes if n.type == "start"), None)
-            if start_node and start_node.type == "virus":
-                self.game_state = GameState.LOSE
-            
-            # Проверяем победу
-            if self.check_victory():
-                self.game_state = GameState.WIN
-                self.stars_earned = self.calculate_stars()
+        """Отдает симуляции прошедшее время фиксированными шагами FIXED_DT"""
+        # Ускорение меняет только объем времени: таймеры вирусов, волны Тишины,
+        # временных связей и уровня идут по часам симуляции и ускоряются вместе
+        self.accumulator += self.clock.get_time() * self.time_scale
+        max_steps = int(MAX_STEPS_PER_FRAME * max(1, self.time_scale))
+        steps = 0
+        while self.accumulator >= FIXED_DT and steps < max_steps:
+            self.accumulator -= FIXED_DT
+            steps += 1
+            if self.sim.game_state == GameState.PLAYING:
+                self.sim.step(FIXED_DT)
+                # Все частицы (связи, вирусы, волна, уничтожение) - одним шагом
+                particle_system.update(FIXED_DT)
+        
+        # Симуляция не успевает: сначала пропускаем отрисовку кадров, а если
+        # и это не помогает - замедляем игру, но не копим долг шагов
+        self.skip_draw = False
+        if steps == max_steps:
+            if self.skipped_frames < MAX_FRAME_SKIP:
+                self.skip_draw = True
+            else:
+                self.accumulator = min(self.accumulator, FIXED_DT)
 
     def draw(self):
+        """Рисует кадр. Возвращает обновленные прямоугольники экрана
+        или None, если перерисован весь экран"""
+        if self.dirty_rects:
+            return self.draw_dirty()
+        
         # Очищаем экран
         self.screen.fill((10, 10, 30))
         
         # Рисуем игровую область
-        game_surface = pygame.Surface((GAME_AREA_WIDTH, SCREEN_HEIGHT))
-        game_surface.fill((10, 10, 30))
+        self.draw_scene(self.game_surface)
+        self.screen.blit(self.game_surface, (0, 0))
+        
+        self.draw_ui()
+        return None
+    
+    def draw_dirty(self):
+        """Перерисовывает только изменившиеся области экрана"""
+        scene_rects = self.collect_scene_rects()
+        if scene_rects is None:
+            self.draw_scene(self.game_surface)
+            self.screen.blit(self.game_surface, (0, 0))
+            scene_rects = [self.scene_regions.bounds]
+        else:
+            for rect in scene_rects:
+                # Толстые линии у границы отсечения растрируются иначе,
+                # поэтому рисуем с запасом, а на экран выводим только rect
+                area = rect.inflate(DIRTY_MARGIN * 2, DIRTY_MARGIN * 2).clip(self.scene_regions.bounds)
+                self.game_surface.set_clip(area)
+                self.draw_scene(self.game_surface, area)
+                self.screen.blit(self.game_surface, rect, rect)
+            self.game_surface.set_clip(None)
+        
+        self.draw_ui()
+        panel_rects = self.ui_manager.regions.collect()
+        if panel_rects is None:
+            panel_rects = [self.ui_manager.regions.bounds]
+        return scene_rects + panel_rects
+    
+    def collect_scene_rects(self):
+        """Собирает грязные области игровой области за кадр"""
+        regions = self.scene_regions
+        
+        for node in self.sim.level_manager.nodes:
+            if node.is_animated():
+                regions.add(node.get_bounds())
+        for virus in self.sim.level_manager.viruses:
+            regions.add(virus.get_bounds())
+        
+        # Анимированные, новые и удаленные связи
+        connections = set(self.sim.connection_manager.connections)
+        for connection in connections:
+            if connection.is_animated() or connection not in self.drawn_connections:
+                regions.add(connection.get_bounds())
+        for connection in self.drawn_connections - connections:
+            regions.add(connection.get_bounds())
+        self.drawn_connections = connections
+        
+        for rect in particle_system.dirty_rects():
+            regions.add(rect)
+        for rect in self.sim.silence.get_dirty_rects(GAME_AREA_WIDTH, SCREEN_HEIGHT):
+            regions.add(rect)
+        
+        preview = self.get_preview_line()
+        if preview:
+            regions.add(self.get_line_bounds(preview[1], preview[2]))
+        
+        # Подсказка статична: перерисовываем, только когда она меняется
+        hint = self.get_hint()
+        if hint != self.drawn_hint:
+            for links, cleared in (hint, self.drawn_hint):
+                for a, b in links:
+                    regions.add(self.get_line_bounds((a.x, a.y), (b.x, b.y)))
+                for node in cleared:
+                    regions.add(node.get_bounds())
+            self.drawn_hint = hint
+        
+        # Сообщение о результате накрывает всю игровую область
+        if self.sim.game_state != GameState.PLAYING:
+            regions.invalidate()
+        return regions.collect()
+    
+    @staticmethod
+    def get_line_bounds(start, end):
+        """Прямоугольник полупрозрачной линии толщиной до 4 пикселей"""
+        return pygame.Rect(min(start[0], end[0]), min(start[1], end[1]),
+                           abs(start[0] - end[0]), abs(start[1] - end[1])).inflate(8, 8)
+    
+    def get_preview_line(self):
+        """Цвет и концы потенциальной связи при наведении или None"""
+        if self.selected_node and self.hover_node and self.hover_node != self.selected_node:
+            if self.hover_node.type != "virus":
+                cost = self.sim.agent.get_connection_cost("enhanced" if self.enhanced_mode else "normal")
+                can_afford = self.sim.player_energy >= cost
+                color = (0, 255, 0) if can_afford else (255, 100, 100)
+                alpha = 150 if can_afford else 80
+                return ((*color, alpha),
+                        (self.selected_node.x, self.selected_node.y),
+                        (self.hover_node.x, self.hover_node.y))
+        return None
+    
+    def draw_scene(self, game_surface, area=None):
+        """Рисует игровую область; с area - только объекты, задевающие ее"""
+        game_surface.fill((10, 10, 30), area)
         
         # Рисуем Тишину
-        self.silence.draw(game_surface, GAME_AREA_WIDTH, SCREEN_HEIGHT)
+        self.sim.silence.draw(game_surface, GAME_AREA_WIDTH, SCREEN_HEIGHT)
         
         # Рисуем связи
-        for connection in self.connection_manager.connections:
-            connection.draw(game_surface)
+        for connection in self.sim.connection_manager.connections:
+            if area is None or area.colliderect(connection.get_bounds()):
+                connection.draw(game_surface)
+        particle_system.draw(game_surface, LAYER_LINKS)
         
         # Рисуем потенциальную связь при наведении
-        if self.selected_node and self.hover_node and self.hover_node != self.selected_node:
-            if self.hover_node.type != "virus":
-                cost = self.agent.get_connection_cost("enhanced" if self.enhanced_mode else "normal")
-                can_afford = self.player_energy >= cost
-                color = (0, 255, 0) if can_afford else (255, 100, 100)
-                alpha = 150 if can_afford else 80
-                
-                # Создаем поверхность с альфа-каналом
-                preview_surface = pygame.Surface((GAME_AREA_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                pygame.draw.line(preview_surface, (*color, alpha), 
-                               (self.selected_node.x, self.selected_node.y),
-                               (self.hover_node.x, self.hover_node.y), 3)
-                game_surface.blit(preview_surface, (0, 0))
+        preview = self.get_preview_line()
+        if preview:
+            draw_alpha_line(game_surface, *preview, 3)
+        
+        # Подсказка маршрута: связи, которые стоит построить
+        links, cleared = self.get_hint()
+        for a, b in links:
+            draw_alpha_line(game_surface, (*HINT_COLOR, 140), (a.x, a.y), (b.x, b.y), 4)
         
         # Рисуем узлы
-        for node in self.level_manager.nodes:
-            node.draw(game_surface)
+        for node in self.sim.level_manager.nodes:
+            if area is None or area.colliderect(node.get_bounds()):
+                node.draw(game_surface)
         
         # Рисуем вирусы
-        for virus in self.level_manager.viruses:
-            virus.draw(game_surface)
-        
-        # Рисуем эффекты уничтожения
-        for effect in self.destruction_effects:
-            alpha = int(255 * (effect['life'] / effect['max_life']))
-            color = (*effect['color'][:3], alpha)
-            size = int(effect['size'])
-            s = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, color, (size, size), size)
-            game_surface.blit(s, (effect['x'] - size, effect['y'] - size))
+        for virus in self.sim.level_manager.viruses:
+            if area is None or area.colliderect(virus.get_bounds()):
+                virus.draw(game_surface)
         
-        # Отображаем игровую поверхность
-        self.screen.blit(game_surface, (0, 0))
+        # Вирусы на маршруте подсказки, которые нужно уничтожить
+        for node in cleared:
+            blit_circle(game_surface, (node.x, node.y), node.radius + 18, HINT_COLOR, 180, 2)
         
+        # Рисуем эффекты вирусов и уничтожения
+        particle_system.draw(game_surface, LAYER_EFFECTS)
+    
+    def draw_ui(self):
         # Рисуем UI
         game_data = {
-            "level_name": self.level_name,
-            "level_description": self.level_description,
-            "player_energy": self.player_energy,
-            "current_level": self.level_manager.current_level,
-            "level_time": self.level_time,
-            "time_left": self.time_left,
-            "agent": self.agent,
-            "enhanced_mode": self.enhanced_mode
+            "level_name": self.sim.level_name,
+            "level_description": self.sim.level_description,
+            "player_energy": self.sim.player_energy,
+            "current_level": self.sim.level_manager.current_level,
+            "last_level": get_level_numbers()[-1],
+            "level_time": self.sim.level_time,
+            "time_left": self.sim.time_left,
+            "agent": self.sim.agent,
+            "enhanced_mode": self.enhanced_mode,
+            "time_scale": self.time_scale
         }
         self.ui_manager.draw_panel(game_data)
         
         # Сообщения о состоянии игры
-        if self.game_state != GameState.PLAYING:
-            stars = getattr(self, 'stars_earned', 0)
-            self.ui_manager.draw_game_state_message(self.game_state, self.time_left, stars)
+        if self.sim.game_state != GameState.PLAYING:
+            stars = self.sim.stars_earned
+            self.ui_manager.draw_game_state_message(self.sim.game_state, self.sim.time_left, stars)
 
     def run(self):
         running = True
         while running:
             running = self.handle_events()
             self.update()
-            self.draw()
-            pygame.display.flip()
+            if self.skip_draw:
+                self.skipped_frames += 1
+            else:
+                self.skipped_frames = 0
+                rects = self.draw()
+                if rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(rects)
             self.clock.tick(FPS)
         
         pygame.quit()
\ No newline at end of file
@@ -0,0 +1,62 @@
+import pygame
+
+# Если грязных областей слишком много, дешевле перерисовать все целиком
+MAX_DIRTY_RECTS = 48
+MAX_DIRTY_AREA = 0.5  # Доля площади области
+
+
+def merge_rects(rects):
+    """Объединяет пересекающиеся прямоугольники, пока пересечения остаются"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        i = 0
+        while i < len(merged):
+            if merged[i].colliderect(rect):
+                rect.union_ip(merged.pop(i))
+                i = 0
+            else:
+                i += 1
+        merged.append(rect)
+    return merged
+
+
+class DirtyRegions:
+    """Грязные прямоугольники одной области экрана.
+
+    Кадр перерисовывает области текущего кадра и предыдущего (там, где
+    объект был раньше, его нужно стереть). collect() возвращает None,
+    если нужна полная перерисовка: после invalidate() или когда областей
+    слишком много.
+    """
+
+    def __init__(self, bounds, max_rects=MAX_DIRTY_RECTS, max_area=MAX_DIRTY_AREA):
+        self.bounds = pygame.Rect(bounds)
+        self.max_rects = max_rects
+        self.max_area = max_area
+        self.previous = []
+        self.current = []
+        self.full = True
+
+    def add(self, rect):
+        rect = pygame.Rect(rect).clip(self.bounds)
+        if rect.width > 0 and rect.height > 0:
+            self.current.append(rect)
+
+    def invalidate(self):
+        """Следующий кадр перерисовывается целиком"""
+        self.full = True
+
+    def collect(self):
+        """Возвращает прямоугольники кадра или None для полной перерисовки"""
+        rects = merge_rects(self.previous + self.current)
+        self.previous = self.current
+        self.current = []
+
+        if self.full:
+            self.full = False
+            return None
+        area = sum(rect.width * rect.height for rect in rects)
+        if len(rects) > self.max_rects or area > self.max_area * self.bounds.width * self.bounds.height:
+            return None
+        return rects
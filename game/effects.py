@@ -1,9 +1,12 @@
-import pygame
-import random
+from .particles import particle_system, LAYER_EFFECTS
+from .sim.rng import default_rng
 
 class EffectManager:
-    def __init__(self):
-        self.particles = []
+    """Эффекты интерфейса; частицы живут в общем пуле particle_system"""
+    
+    def __init__(self, rng=None):
+        # Потоки случайных чисел партии (RandomStreams); разброс частиц - из rng.effects
+        self.rng = rng if rng is not None else default_rng
         
     def add_connection_effect(self, node1, node2, connection_type):
         """Добавляет эффект создания связи"""
@@ -12,17 +15,14 @@ class EffectManager:
         # Создаем частицы вдоль линии
         points = self.calculate_line_points(node1.x, node1.y, node2.x, node2.y, 20)
         
-        for point in points:
-            self.particles.append({
-                'x': point[0],
-                'y': point[1],
-                'color': color,
-                'size': random.randint(2, 5),
-                'life': 1.0,
-                'max_life': 1.0,
-                'vx': random.uniform(-1, 1),
-                'vy': random.uniform(-1, 1)
-            })
+        particle_system.emit(
+            [point[0] for point in points],
+            [point[1] for point in points],
+            vx=[self.rng.effects.uniform(-1, 1) for point in points],
+            vy=[self.rng.effects.uniform(-1, 1) for point in points],
+            size=[self.rng.effects.randint(2, 5) for point in points],
+            color=color, decay=1.0, shrink=0.95
+        )
             
     def calculate_line_points(self, x1, y1, x2, y2, num_points):
         """Вычисляет точки вдоль линии"""
@@ -36,21 +36,8 @@ class EffectManager:
         
     def update(self, dt):
         """Обновляет все эффекты"""
-        for particle in self.particles[:]:
-            particle['life'] -= dt / 1000.0
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['size'] *= 0.95
-            
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        particle_system.update(dt)
                 
     def draw(self, screen):
         """Отрисовывает все эффекты"""
-        for particle in self.particles:
-            alpha = int(255 * (particle['life'] / particle['max_life']))
-            color = (*particle['color'][:3], alpha)
-            
-            surf = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, color, (particle['size'], particle['size']), particle['size'])
-            screen.blit(surf, (particle['x'] - particle['size'], particle['y'] - particle['size']))
\ No newline at end of file
+        particle_system.draw(screen, LAYER_EFFECTS)
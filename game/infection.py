@@ -0,0 +1,91 @@
+class InfectionIndex:
+    """Инкрементальный индекс для распространения вирусов.
+    
+    Хранит для каждого узла число соседних firewall-узлов (узел с хотя бы
+    одним таким соседом защищен) и для каждого зараженного узла - его
+    незащищенных нейтральных соседей. Индекс обновляется по событиям
+    связей и смены типа узлов, поэтому тик распространения стоит O(degree).
+    """
+    
+    def __init__(self, connection_manager):
+        self.connection_manager = connection_manager
+        self.protection = {}  # узел -> число соседних firewall
+        self.candidates = {}  # зараженный узел -> {цель: None}, в порядке добавления
+        
+    def reset(self):
+        self.protection = {}
+        self.candidates = {}
+        
+    def _linked(self, node):
+        return self.connection_manager.adjacency.get(node, {}).keys()
+    
+    def is_protected(self, node):
+        return self.protection.get(node, 0) > 0
+    
+    def get_candidates(self, virus_node):
+        """Незащищенные нейтральные соседи зараженного узла"""
+        return self.candidates.get(virus_node, {}).keys()
+    
+    def _is_candidate(self, virus_node, node):
+        return (virus_node.type == "virus" and node.type == "neutral"
+                and not self.is_protected(node)
+                and self.connection_manager.connection_exists(virus_node, node))
+    
+    def _refresh_pair(self, virus_node, node):
+        if self._is_candidate(virus_node, node):
+            self.candidates.setdefault(virus_node, {})[node] = None
+        else:
+            targets = self.candidates.get(virus_node)
+            if targets is not None:
+                targets.pop(node, None)
+                
+    def _add_protection(self, node, delta):
+        was_protected = self.is_protected(node)
+        self.protection[node] = self.protection.get(node, 0) + delta
+        if was_protected != self.is_protected(node):
+            for other in self._linked(node):
+                if other.type == "virus":
+                    self._refresh_pair(other, node)
+                    
+    def on_connection_added(self, connection):
+        node1, node2 = connection.node1, connection.node2
+        if node1.type == "firewall":
+            self._add_protection(node2, 1)
+        if node2.type == "firewall":
+            self._add_protection(node1, 1)
+        if node1.type == "virus":
+            self._refresh_pair(node1, node2)
+        if node2.type == "virus":
+            self._refresh_pair(node2, node1)
+            
+    def on_connection_removed(self, connection):
+        node1, node2 = connection.node1, connection.node2
+        if node1.type == "firewall":
+            self._add_protection(node2, -1)
+        if node2.type == "firewall":
+            self._add_protection(node1, -1)
+        if node1.type == "virus":
+            self._refresh_pair(node1, node2)
+        if node2.type == "virus":
+            self._refresh_pair(node2, node1)
+            
+    def on_node_type_changed(self, node, old_type, new_type):
+        linked = list(self._linked(node))
+        if old_type == "firewall":
+            for other in linked:
+                self._add_protection(other, -1)
+        if new_type == "firewall":
+            for other in linked:
+                self._add_protection(other, 1)
+                
+        if old_type == "virus":
+            self.candidates.pop(node, None)
+        if new_type == "virus":
+            self.candidates[node] = {}
+            for other in linked:
+                self._refresh_pair(node, other)
+                
+        # Узел мог стать целью для соседних вирусов или перестать ею быть
+        for other in linked:
+            if other.type == "virus":
+                self._refresh_pair(other, node)
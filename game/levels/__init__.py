@@ -1,27 +1,109 @@
-from .level_1 import get_level as get_level_1
-from .level_2 import get_level as get_level_2
-from .level_3 import get_level as get_level_3
-from .level_4 import get_level as get_level_4
-from .level_5 import get_level as get_level_5
-from .level_6 import get_level as get_level_6
-from .level_7 import get_level as get_level_7
-from .level_8 import get_level as get_level_8
-from .level_9 import get_level as get_level_9
-from .level_10 import get_level as get_level_10
+import importlib
+import importlib.util
+import os
+import re
+
+# Модуль уровня - level_<номер>.py с функцией get_level()
+LEVEL_FILE = re.compile(r"^level_(\d+)\.py$")
+# Каждый подкаталог packs - пак уровней, подключается без правки этого файла
+PACKS_DIR = os.path.join(os.path.dirname(__file__), "packs")
+
+
+class LevelRegistry:
+    """Реестр уровней с ленивой загрузкой.
+
+    Уровни находятся по именам файлов level_<номер>.py, но модуль
+    импортируется и конфигурация строится только при первом запросе
+    этого уровня, дальше она берется из кэша. Кроме уровней пакета
+    подключаются паки - каталоги с такими же файлами: все каталоги
+    в game/levels/packs и добавленные через add_pack(). Уровень пака
+    заменяет уровень с тем же номером.
+    """
+
+    def __init__(self, package=__name__, directory=os.path.dirname(__file__), packs_dir=PACKS_DIR):
+        self.package = package
+        self.directory = directory
+        self.packs_dir = packs_dir
+        self.packs = []
+        self.sources = None  # номер -> путь к файлу уровня
+        self.numbers = []
+        self.cache = {}
+
+    def add_pack(self, directory):
+        """Подключает каталог с файлами level_<номер>.py"""
+        self.packs.append(directory)
+        self.sources = None
+        self.cache = {}
+
+    def _scan(self, directory, sources):
+        for name in sorted(os.listdir(directory)):
+            match = LEVEL_FILE.match(name)
+            if match:
+                sources[int(match.group(1))] = os.path.join(directory, name)
+
+    def discover(self):
+        """Номер уровня -> файл; только список файлов, без импорта"""
+        if self.sources is None:
+            sources = {}
+            self._scan(self.directory, sources)
+            packs = []
+            if os.path.isdir(self.packs_dir):
+                packs = [os.path.join(self.packs_dir, name) for name in sorted(os.listdir(self.packs_dir))
+                         if os.path.isdir(os.path.join(self.packs_dir, name))]
+            for directory in packs + self.packs:
+                self._scan(directory, sources)
+            self.sources = sources
+            self.numbers = sorted(sources)
+        return self.sources
+
+    def get_numbers(self):
+        """Номера всех уровней по возрастанию"""
+        self.discover()
+        return self.numbers
+
+    def _load_module(self, path):
+        directory, name = os.path.split(path)
+        if directory == self.directory:
+            return importlib.import_module(f"{self.package}.{name[:-3]}")
+        # Файлы паков загружаются по пути: пак не обязан быть пакетом Python
+        spec = importlib.util.spec_from_file_location(f"{self.package}.pack.{name[:-3]}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def get(self, level_num):
+        """Конфигурация уровня; KeyError, если такого уровня нет.
+
+        Конфигурация общая для всех вызовов - ее не нужно изменять.
+        """
+        config = self.cache.get(level_num)
+        if config is None:
+            path = self.discover()[level_num]
+            config = self._load_module(path).get_level()
+            self.cache[level_num] = config
+        return config
+
+
+# Реестр уровней игры
+registry = LevelRegistry()
+
 
 def get_level(level_num):
-    """Возвращает конфигурацию уровня по номеру"""
-    levels = {
-        1: get_level_1(),
-        2: get_level_2(),
-        3: get_level_3(),
-        4: get_level_4(),
-        5: get_level_5(),
-        6: get_level_6(),
-        7: get_level_7(),
-        8: get_level_8(),
-        9: get_level_9(),
-        10: get_level_10()
-    }
-    
-    return levels.get(level_num, get_level_1())
\ No newline at end of file
+    """Возвращает конфигурацию уровня по номеру; неизвестный номер - уровень 1"""
+    try:
+        return registry.get(level_num)
+    except KeyError:
+        return registry.get(1)
+
+
+def get_level_numbers():
+    """Номера всех доступных уровней по возрастанию"""
+    return registry.get_numbers()
+
+
+def get_next_level(level_num):
+    """Номер уровня после level_num; для последнего - он сам"""
+    for number in get_level_numbers():
+        if number > level_num:
+            return number
+    return level_num
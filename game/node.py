@@ -1,32 +1,12 @@
 import pygame
 import math
-import time
+from .sim.node import Node as NodeModel
+from .sprites import blit_circle
+from .text import render_text
 
-class Node:
-    def __init__(self, x, y, type="neutral"):
-        self.x = x
-        self.y = y
-        self.radius = 20
-        self.type = type
-        self.connected_to = []
-        self.selected = False
-        self.pulse = 0.0
-        self.animation_time = 0.0
-        self.particles = []
-        
-    def update(self, dt):
-        # Плавная пульсация для всех узлов
-        self.pulse = (self.pulse + dt / 1000.0) % 1.0
-        self.animation_time += dt / 1000.0
-        
-        # Обновляем частицы
-        for particle in self.particles[:]:
-            particle['life'] -= dt / 1000.0 * 2
-            particle['x'] += particle.get('vx', 0) * dt / 16.0
-            particle['y'] += particle.get('vy', 0) * dt / 16.0
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
-        
+class Node(NodeModel):
+    """Узел с отрисовкой; состояние и логика - в game.sim.node"""
+    
     def draw(self, screen):
         # Вызываем специализированные методы отрисовки
         if self.type == "start":
@@ -51,9 +31,7 @@ class Node:
             for i in range(2):
                 radius = self.radius + 5 + i * 2
                 alpha = 200 - i * 100
-                s = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(s, (255, 255, 0, alpha), (radius, radius), radius, 2)
-                screen.blit(s, (self.x - radius, self.y - radius))
+                blit_circle(screen, (self.x, self.y), radius, (255, 255, 0), alpha, 2)
     
     def draw_neural_core(self, screen):
         """Ядро нейросети с анимацией импульсов"""
@@ -69,17 +47,13 @@ class Node:
             
             # Частицы вокруг ядра
             alpha = int(100 + 155 * pulse)
-            s = pygame.Surface((6, 6), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*base_color, alpha), (3, 3), 3)
-            screen.blit(s, (x - 3, y - 3))
+            blit_circle(screen, (x, y), 3, base_color, alpha)
         
         # Многослойное свечение
         for i in range(4, 0, -1):
             glow_radius = self.radius + i * 4
             alpha = int(50 + 100 * pulse / (i + 1))
-            s = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*base_color, alpha), (glow_radius, glow_radius), glow_radius)
-            screen.blit(s, (self.x - glow_radius, self.y - glow_radius))
+            blit_circle(screen, (self.x, self.y), glow_radius, base_color, alpha)
         
         # Основное ядро
         core_radius = int(self.radius + 3 * pulse)
@@ -123,9 +97,7 @@ class Node:
         for i in range(2):
             glow_radius = self.radius + 5 + i * 3
             alpha = int(80 + 100 * pulse)
-            s = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*base_color, alpha), (glow_radius, glow_radius), glow_radius, 2)
-            screen.blit(s, (self.x - glow_radius, self.y - glow_radius))
+            blit_circle(screen, (self.x, self.y), glow_radius, base_color, alpha, 2)
     
     def draw_corrupted_node(self, screen):
         """Искаженная геометрия для вирусов"""
@@ -160,9 +132,7 @@ class Node:
         for i in range(3):
             glow_radius = int(self.radius + 5 + i * 4 + pulse * 3)
             alpha = int(100 + 100 * pulse)
-            s = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*base_color, alpha), (glow_radius, glow_radius), glow_radius, 2)
-            screen.blit(s, (self.x - glow_radius, self.y - glow_radius))
+            blit_circle(screen, (self.x, self.y), glow_radius, base_color, alpha, 2)
     
     def draw_shield_node(self, screen):
         """Защитный узел с барьерами"""
@@ -185,9 +155,7 @@ class Node:
         for i in range(2):
             ring_radius = self.radius + 12 + i * 3
             alpha = 150 - i * 50
-            s = pygame.Surface((ring_radius * 2, ring_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*base_color, alpha), (ring_radius, ring_radius), ring_radius, 2)
-            screen.blit(s, (self.x - ring_radius, self.y - ring_radius))
+            blit_circle(screen, (self.x, self.y), ring_radius, base_color, alpha, 2)
     
     def draw_amplifier_node(self, screen):
         """Усилитель с волнами"""
@@ -197,9 +165,7 @@ class Node:
         for wave in range(3):
             wave_radius = self.radius + 5 + wave * 8 + math.sin(self.animation_time * 2) * 3
             alpha = int(150 / (wave + 1))
-            s = pygame.Surface((int(wave_radius * 2), int(wave_radius * 2)), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*base_color, alpha), (int(wave_radius), int(wave_radius)), int(wave_radius), 2)
-            screen.blit(s, (self.x - wave_radius, self.y - wave_radius))
+            blit_circle(screen, (self.x, self.y), wave_radius, base_color, alpha, 2)
         
         # Центр
         pygame.draw.circle(screen, base_color, (self.x, self.y), self.radius)
@@ -219,9 +185,7 @@ class Node:
         
         # Мигающий эффект
         alpha = int(100 + 155 * blink)
-        s = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (*base_color, alpha), (self.radius, self.radius), self.radius)
-        screen.blit(s, (self.x - self.radius, self.y - self.radius))
+        blit_circle(screen, (self.x, self.y), self.radius, base_color, alpha)
         
         # Пунктирная обводка
         for i in range(8):
@@ -247,8 +211,7 @@ class Node:
         pygame.draw.circle(screen, base_color, (self.x, self.y), self.radius)
         
         # Внутренний символ
-        font = pygame.font.Font(None, 20)
-        text = font.render("?", True, (255, 255, 255))
+        text = render_text("?", 20, (255, 255, 255))
         text_rect = text.get_rect(center=(self.x, self.y))
         screen.blit(text, text_rect)
     
@@ -262,14 +225,20 @@ class Node:
             for i in range(2):
                 glow_radius = self.radius + 3 + i * 2
                 alpha = int(80 + 80 * pulse)
-                s = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-                pygame.draw.circle(s, (*base_color, alpha), (glow_radius, glow_radius), glow_radius)
-                screen.blit(s, (self.x - glow_radius, self.y - glow_radius))
+                blit_circle(screen, (self.x, self.y), glow_radius, base_color, alpha)
         
         # Основной круг
         pygame.draw.circle(screen, base_color, (self.x, self.y), self.radius)
         pygame.draw.circle(screen, (255, 255, 255), (self.x, self.y), self.radius, 1)
     
-    def is_clicked(self, pos):
-        distance = ((self.x - pos[0]) ** 2 + (self.y - pos[1]) ** 2) ** 0.5
-        return distance <= self.radius
\ No newline at end of file
+    # Самый широкий узел - усилитель: волна радиуса radius + 24
+    BOUNDS_MARGIN = 26
+    
+    def is_animated(self):
+        """Меняется ли картинка узла от кадра к кадру"""
+        return self.type != "neutral" or self.selected
+    
+    def get_bounds(self):
+        """Прямоугольник, в который помещается отрисовка узла"""
+        half = self.radius + self.BOUNDS_MARGIN
+        return pygame.Rect(self.x - half, self.y - half, half * 2, half * 2)
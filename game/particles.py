@@ -0,0 +1,151 @@
+import numpy as np
+
+from .sprites import sprite_cache
+
+# Скорости частиц заданы в пикселях за кадр длительностью FRAME_MS
+FRAME_MS = 16.0
+
+# Слои определяют порядок отрисовки относительно остальной сцены
+LAYER_LINKS = 0    # поверх связей, под узлами
+LAYER_EFFECTS = 1  # поверх узлов и вирусов
+LAYER_WAVE = 2     # внутри волны Тишины
+
+
+class ParticleSystem:
+    """Общий пул частиц в виде структуры массивов NumPy.
+    
+    Позиция, скорость, время жизни, размер и цвет хранятся в заранее
+    выделенных массивах; update() продвигает все частицы одним векторным
+    шагом и уплотняет массивы по маске живых частиц. Время жизни убывает
+    со скоростью decay в секунду, размер умножается на shrink за каждые
+    FRAME_MS, поэтому эффекты не зависят от частоты кадров.
+    """
+    
+    FIELDS = ("x", "y", "vx", "vy", "life", "size", "decay", "shrink", "layer", "color")
+    
+    def __init__(self, capacity=1024):
+        self.count = 0
+        self._allocate(capacity)
+        
+    def _allocate(self, capacity):
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.decay = np.zeros(capacity, dtype=np.float32)
+        self.shrink = np.ones(capacity, dtype=np.float32)
+        self.layer = np.zeros(capacity, dtype=np.int8)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        
+    @property
+    def capacity(self):
+        return len(self.x)
+    
+    def _reserve(self, extra):
+        needed = self.count + extra
+        if needed <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = {name: getattr(self, name)[:self.count] for name in self.FIELDS}
+        self._allocate(capacity)
+        for name, values in old.items():
+            getattr(self, name)[:self.count] = values
+            
+    def clear(self):
+        self.count = 0
+        
+    def emit(self, x, y, vx=0.0, vy=0.0, life=1.0, size=3.0, color=(255, 255, 255),
+             decay=1.0, shrink=1.0, layer=LAYER_EFFECTS):
+        """Добавляет частицы. Параметры - числа или последовательности
+        одинаковой длины; color - один цвет или по цвету на частицу."""
+        amount = max(np.size(value) for value in (x, y, vx, vy, life, size))
+        self._reserve(amount)
+        batch = slice(self.count, self.count + amount)
+        self.x[batch] = x
+        self.y[batch] = y
+        self.vx[batch] = vx
+        self.vy[batch] = vy
+        self.life[batch] = life
+        self.size[batch] = size
+        self.decay[batch] = decay
+        self.shrink[batch] = shrink
+        self.layer[batch] = layer
+        self.color[batch] = np.asarray(color)[..., :3]
+        self.count += amount
+        
+    def update(self, dt):
+        """Продвигает все частицы на dt мс и удаляет погибшие"""
+        n = self.count
+        if n == 0:
+            return
+        steps = dt / FRAME_MS
+        self.x[:n] += self.vx[:n] * steps
+        self.y[:n] += self.vy[:n] * steps
+        self.life[:n] -= self.decay[:n] * (dt / 1000.0)
+        self.size[:n] *= self.shrink[:n] ** steps
+        
+        alive = self.life[:n] > 0
+        survivors = int(np.count_nonzero(alive))
+        if survivors < n:
+            for name in self.FIELDS:
+                array = getattr(self, name)
+                array[:survivors] = array[:n][alive]
+            self.count = survivors
+            
+    def draw(self, screen, layer):
+        """Рисует частицы одного слоя одним вызовом Surface.blits.
+        
+        Частицы группируются по ключу (размер, цвет, квантованная alpha);
+        спрайт для каждой группы берется из sprite_cache один раз за кадр.
+        """
+        n = self.count
+        # Частицы вне области отсечения не рисуем вовсе
+        clip = screen.get_clip()
+        x, y, size = self.x[:n], self.y[:n], self.size[:n]
+        visible = np.nonzero(
+            (self.layer[:n] == layer) & (size >= 1)
+            & (x + size >= clip.left) & (x - size < clip.right)
+            & (y + size >= clip.top) & (y - size < clip.bottom)
+        )[0]
+        if len(visible) == 0:
+            return
+        sizes = self.size[visible].astype(np.int64)
+        step = sprite_cache.alpha_step
+        alphas = (np.minimum(self.life[visible], 1.0) * 255).astype(np.int64)
+        alphas = np.minimum(np.round(alphas / step) * step, 255).astype(np.int64)
+        colors = self.color[visible].astype(np.int64)
+        
+        # Упаковываем ключ спрайта в одно число, чтобы сгруппировать через unique
+        keys = (sizes << 32) | (colors[:, 0] << 24) | (colors[:, 1] << 16) | (colors[:, 2] << 8) | alphas
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        atlas = [
+            sprite_cache.circle(key >> 32, ((key >> 24) & 255, (key >> 16) & 255, (key >> 8) & 255), key & 255)
+            for key in unique_keys.tolist()
+        ]
+        
+        xs = (self.x[visible] - sizes).tolist()
+        ys = (self.y[visible] - sizes).tolist()
+        screen.blits([(atlas[i], (x, y)) for i, x, y in zip(inverse.tolist(), xs, ys)], False)
+
+    def dirty_rects(self, cell_size=64):
+        """Клетки сетки cell_size, в которых есть частицы, с запасом на размер"""
+        n = self.count
+        if n == 0:
+            return []
+        margin = int(self.size[:n].max()) + 1
+        cells = np.unique(
+            np.stack((self.x[:n] // cell_size, self.y[:n] // cell_size), axis=1).astype(np.int32),
+            axis=0
+        )
+        return [
+            (cx * cell_size - margin, cy * cell_size - margin, cell_size + margin * 2, cell_size + margin * 2)
+            for cx, cy in cells.tolist()
+        ]
+
+
+# Общий пул частиц игры
+particle_system = ParticleSystem()
@@ -0,0 +1,68 @@
+import heapq
+import itertools
+
+
+class ScheduledEvent:
+    """Запланированный вызов; отменяется флагом, из кучи не удаляется"""
+    __slots__ = ("time", "callback", "args", "cancelled")
+    
+    def __init__(self, time, callback, args):
+        self.time = time
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        
+    def cancel(self):
+        self.cancelled = True
+
+
+class EventScheduler:
+    """Планировщик таймеров на куче.
+    
+    Волны Тишины и временные связи регистрируют время своего следующего
+    срабатывания, а advance() вызывает только наступившие события.
+    Стоимость кадра зависит от числа сработавших событий, а не от
+    числа сущностей. Время - миллисекунды игрового времени.
+    """
+    
+    def __init__(self):
+        self.time = 0
+        self._queue = []
+        self._counter = itertools.count()  # порядок для событий с одинаковым временем
+        
+    def clear(self):
+        """Отменяет все события (время не сбрасывается)"""
+        self._queue = []
+        
+    def reset(self):
+        """Отменяет все события и возвращает время к нулю"""
+        self.clear()
+        self.time = 0
+        self._counter = itertools.count()
+        
+    def schedule(self, delay, callback, *args):
+        """Вызывает callback(*args) через delay мс"""
+        return self.schedule_at(self.time + delay, callback, *args)
+    
+    def schedule_at(self, time, callback, *args):
+        """Вызывает callback(*args) в момент time"""
+        event = ScheduledEvent(time, callback, args)
+        heapq.heappush(self._queue, (time, next(self._counter), event))
+        return event
+    
+    def advance(self, dt):
+        """Сдвигает время на dt мс и вызывает наступившие события по порядку"""
+        target = self.time + dt
+        queue = self._queue
+        while queue and queue[0][0] <= target:
+            time, _, event = heapq.heappop(queue)
+            if event.cancelled:
+                continue
+            # Внутри обработчика время равно моменту события, чтобы
+            # периодические таймеры не накапливали сдвиг
+            self.time = time
+            event.callback(*event.args)
+        self.time = target
+        
+    def __len__(self):
+        return sum(1 for _, _, event in self._queue if not event.cancelled)
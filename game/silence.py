@@ -1,102 +1,51 @@
 import pygame
-import random
 import math
+import numpy as np
+from .sim.silence import Silence as SilenceModel
+from .text import render_text
+from .particles import particle_system, FRAME_MS, LAYER_WAVE, LAYER_EFFECTS
 
-class Silence:
-    def __init__(self):
-        self.wave_timer = 0
-        self.wave_interval = 30000
-        self.wave_active = False
-        self.wave_progress = 0.0
-        self.particles = []
-        self.next_wave_time = 0
-        self.reset()
-        
-    def reset(self):
-        """Сброс состояния при загрузке нового уровня"""
-        self.wave_timer = 0
-        self.wave_active = False
-        self.wave_progress = 0.0
-        self.particles = []
-        self.next_wave_time = self.wave_interval
-        
-    def update(self, connections, nodes, dt):
-        self.wave_timer += dt
-        
-        if self.wave_timer >= self.next_wave_time and not self.wave_active:
-            self.start_wave()
-            self.wave_timer = 0
-            # Случайный интервал между волнами (25-35 секунд)
-            self.next_wave_time = random.randint(25000, 35000)
-            
-        if self.wave_active:
-            self.wave_progress += 0.015
-            self.update_particles(dt)
-            
-            if self.wave_progress >= 1.0:
-                self.wave_active = False
-                self.destroy_normal_connections(connections)
-                self.wave_progress = 0.0
-                
-    def start_wave(self):
-        self.wave_active = True
-        self.wave_progress = 0.0
-        self.create_wave_particles()
+# Частицы Тишины теряли 0.02 жизни за кадр
+PARTICLE_DECAY = 0.02 * 1000.0 / FRAME_MS
+
+# Волнистая граница циклична с периодом 2pi; столько заготовок на период
+EDGE_PHASES = 32
+# Запас по высоте полосы границы: амплитуда 10 и радиус кружков 3
+EDGE_MARGIN = 13
+
+class Silence(SilenceModel):
+    """Тишина с частицами и отрисовкой волны; расписание волн - в game.sim.silence"""
+    
+    def __init__(self, rng=None):
+        super().__init__(rng)
+        # Кэши отрисовки волны: столбцы градиента по высоте и полосы границы по фазе
+        self.gradient_columns = {}
+        self.edge_strips = {}
+        self.wave_surface = None
         
     def create_wave_particles(self):
         """Создает частицы для волны"""
-        for i in range(50):
-            self.particles.append({
-                'x': random.randint(0, 900),
-                'y': 700,
-                'size': random.randint(3, 8),
-                'vx': 0,  # Горизонтальная скорость
-                'vy': -random.uniform(2, 5),  # Вертикальная скорость (вверх)
-                'color': (150, 0, 0, 150),
-                'life': 1.0
-            })
-            
-    def update_particles(self, dt):
-        """Обновляет частицы волны"""
-        for particle in self.particles[:]:
-            # Обновляем позицию с учетом скорости
-            particle['x'] += particle.get('vx', 0)
-            particle['y'] += particle.get('vy', 0)
-            particle['life'] -= 0.02
-            
-            if particle['life'] <= 0 or particle['y'] < 0:
-                self.particles.remove(particle)
-                
-    def destroy_normal_connections(self, connections):
-        connections_to_remove = []
-        for connection in connections:
-            if connection.type == "normal":
-                connections_to_remove.append(connection)
-                # Эффект разрушения связи
-                self.create_break_effect(connection)
+        particle_system.emit(
+            [self.rng.effects.randint(0, 900) for i in range(50)], 700,
+            vy=[-self.rng.effects.uniform(2, 5) for i in range(50)],  # Вверх
+            size=[self.rng.effects.randint(3, 8) for i in range(50)],
+            color=(150, 0, 0), decay=PARTICLE_DECAY, layer=LAYER_WAVE
+        )
                 
-        for connection in connections_to_remove:
-            connections.remove(connection)
-            
     def create_break_effect(self, connection):
         """Эффект разрыва связи"""
         x1, y1 = connection.node1.x, connection.node1.y
         x2, y2 = connection.node2.x, connection.node2.y
         
-        for i in range(10):
-            t = i / 10.0
-            x = x1 + (x2 - x1) * t
-            y = y1 + (y2 - y1) * t
-            
-            self.particles.append({
-                'x': x,
-                'y': y,
-                'size': random.randint(2, 4),
-                'vx': random.uniform(-2, 2),  # Используем vx вместо speed_x
-                'vy': random.uniform(-2, 2),  # Используем vy вместо speed_y
-                'color': (255, 100, 100, 200),
-                'life': 1.0
-            })
+        ts = [i / 10.0 for i in range(10)]
+        particle_system.emit(
+            [x1 + (x2 - x1) * t for t in ts],
+            [y1 + (y2 - y1) * t for t in ts],
+            vx=[self.rng.effects.uniform(-2, 2) for t in ts],
+            vy=[self.rng.effects.uniform(-2, 2) for t in ts],
+            size=[self.rng.effects.randint(2, 4) for t in ts],
+            color=(255, 100, 100), decay=PARTICLE_DECAY, layer=LAYER_EFFECTS
+        )
                 
     def draw(self, screen, width, height):
         # Полоса прогресса волны (красная)
@@ -111,44 +60,77 @@ class Silence:
         pygame.draw.rect(screen, (100, 100, 100), (0, height - 15, width, 15), 1)
         
         # Текст
-        font = pygame.font.Font(None, 20)
-        time_left = (self.next_wave_time - self.wave_timer) // 1000
-        text = font.render(f"Волна через: {time_left}с", True, (255, 255, 255))
+        time_left = int((self.next_wave_time - self.wave_timer) // 1000)
+        text = render_text(f"Волна через: {time_left}с", 20, (255, 255, 255))
         screen.blit(text, (10, height - 30))
         
         # Анимация волны
         if self.wave_active:
             self.draw_wave(screen, width, height)
             
+    def get_gradient_column(self, wave_height):
+        """Столбец шириной 1 пиксель с градиентом волны заданной высоты"""
+        column = self.gradient_columns.get(wave_height)
+        if column is None:
+            column = pygame.Surface((1, wave_height), pygame.SRCALPHA)
+            column.fill((100, 0, 0, 0))
+            rows = np.arange(wave_height)
+            alpha = pygame.surfarray.pixels_alpha(column)
+            # Та же формула, что у прежней построчной заливки
+            alpha[0, :] = (150 * (1 - (wave_height - rows) / wave_height)).astype(np.uint8)
+            del alpha
+            self.gradient_columns[wave_height] = column
+        return column
+        
+    def get_edge_strip(self, width, phase):
+        """Полоса с волнистой границей для одной из EDGE_PHASES фаз"""
+        key = (width, phase)
+        strip = self.edge_strips.get(key)
+        if strip is None:
+            strip = pygame.Surface((width, EDGE_MARGIN * 2 + 1), pygame.SRCALPHA)
+            shift = phase * 2 * math.pi / EDGE_PHASES
+            for x in range(0, width, 5):
+                wave_offset = math.sin(x * 0.1 + shift) * 10
+                pygame.draw.circle(strip, (200, 0, 0, 200),
+                                 (x, EDGE_MARGIN + math.floor(wave_offset)), 3)
+            self.edge_strips[key] = strip
+        return strip
+        
+    def get_dirty_rects(self, width, height):
+        """Области, которые Тишина меняет каждый кадр: полоса и волна"""
+        rects = [pygame.Rect(0, height - 30, width, 30)]
+        if self.wave_active:
+            wave_height = int(height * self.wave_progress)
+            rects.append(pygame.Rect(0, height - wave_height, width, wave_height))
+        return rects
+            
     def draw_wave(self, screen, width, height):
-        """Рисует анимированную волну"""
+        """Рисует анимированную волну из закэшированных заготовок"""
         wave_height = int(height * self.wave_progress)
         
         if wave_height <= 0:
             return
+        wave_rect = pygame.Rect(0, height - wave_height, width, wave_height)
+        if not wave_rect.colliderect(screen.get_clip()):
+            return
             
-        # Создаем поверхность для волны
-        wave_surface = pygame.Surface((width, wave_height), pygame.SRCALPHA)
+        # Поверхность волны переиспользуется, кадр рисует в ее верхнюю часть
+        if self.wave_surface is None or self.wave_surface.get_size() != (width, height):
+            self.wave_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        wave_surface = self.wave_surface.subsurface((0, 0, width, wave_height))
+        
+        # Градиентная заливка - растянутый по ширине столбец
+        pygame.transform.scale(self.get_gradient_column(wave_height), (width, wave_height), wave_surface)
         
-        # Градиентная заливка
-        for y in range(wave_height):
-            alpha = int(150 * (1 - y / wave_height))
-            color = (100, 0, 0, alpha)
-            pygame.draw.line(wave_surface, color, (0, wave_height - y), (width, wave_height - y))
-            
-        # Рисуем частицы
-        for particle in self.particles:
-            alpha = int(255 * particle['life'])
-            color = (*particle['color'][:3], alpha)
-            particle_size = int(particle['size'])
-            pygame.draw.circle(wave_surface, color, 
-                             (int(particle['x']), int(particle['y'] - (700 - wave_height))), 
-                             particle_size)
-            
         # Волнистая граница
-        for x in range(0, width, 5):
-            wave_offset = math.sin(x * 0.1 + pygame.time.get_ticks() * 0.01) * 10
-            pygame.draw.circle(wave_surface, (200, 0, 0, 200), 
-                             (x, int(wave_height + wave_offset)), 3)
+        phase_angle = (pygame.time.get_ticks() * 0.01) % (2 * math.pi)
+        phase = int(phase_angle / (2 * math.pi) * EDGE_PHASES) % EDGE_PHASES
+        wave_surface.blit(self.get_edge_strip(width, phase), (0, wave_height - EDGE_MARGIN))
             
-        screen.blit(wave_surface, (0, height - wave_height))
\ No newline at end of file
+        screen.blit(wave_surface, (0, height - wave_height))
+        
+        # Частицы волны видны только внутри нее
+        clip = screen.get_clip()
+        screen.set_clip(wave_rect.clip(clip))
+        particle_system.draw(screen, LAYER_WAVE)
+        screen.set_clip(clip)
\ No newline at end of file
@@ -0,0 +1,11 @@
+# Модель игры без pygame: узлы, связи, вирусы, Тишина и шаг симуляции.
+# Классы из game.node, game.connection и т.д. наследуют модель и добавляют отрисовку.
+from .node import Node
+from .connection import Connection
+from .virus import Virus
+from .silence import Silence
+from .level import LevelManager
+from .connections import ConnectionManager
+from .simulation import FIXED_DT, GameState, Simulation
+from .rng import RandomStreams
+from .env import SinapsisEnv, VectorEnv
@@ -0,0 +1,56 @@
+from .rng import default_rng
+
+
+class Connection:
+    def __init__(self, node1, node2, connection_type="normal", duration=None, clock=None, rng=None, distance=None):
+        self.node1 = node1
+        self.node2 = node2
+        # Часы симуляции (объект с полем time в мс), а не настенное время
+        self.clock = clock
+        self.rng = rng if rng is not None else default_rng
+        self.type = connection_type
+        self.color = self.get_color()
+        self.width = 3 if connection_type == "normal" else 5
+        # Длину передает ConnectionManager из таблицы расстояний уровня
+        self.distance = distance if distance is not None else self.calculate_distance()
+        self.created_time = self.now()
+        self.duration = duration  # Для временных связей
+        self.expiry_event = None  # Событие планировщика, удаляющее временную связь
+        self.animation_time = 0.0
+        
+    def calculate_distance(self):
+        return ((self.node1.x - self.node2.x) ** 2 + (self.node1.y - self.node2.y) ** 2) ** 0.5
+        
+    def now(self):
+        """Время симуляции в секундах"""
+        return self.clock.time / 1000.0 if self.clock is not None else 0.0
+        
+    def is_too_long(self):
+        # Максимальная длина связи - 250 пикселей
+        return self.distance > 250
+    
+    def is_expired(self):
+        """Проверяет, истекла ли временная связь"""
+        if self.duration is None:
+            return False
+        return self.now() - self.created_time > self.duration
+    
+    def get_time_remaining(self):
+        """Возвращает оставшееся время для временной связи"""
+        if self.duration is None:
+            return None
+        return max(0, self.duration - (self.now() - self.created_time))
+        
+    def get_color(self):
+        colors = {
+            "normal": (0, 255, 0),
+            "enhanced": (0, 200, 255),
+            "temporary": (255, 200, 0),
+            "firewall": (100, 200, 255),
+            "invalid": (255, 0, 0)  # Для слишком длинных связей
+        }
+        return colors.get(self.type, (0, 255, 0))
+    
+    def update(self, dt):
+        """Обновляет анимацию связи"""
+        self.animation_time += dt / 1000.0
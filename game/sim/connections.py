@@ -0,0 +1,219 @@
+from ..connectivity import ConnectivityTracker
+from ..infection import InfectionIndex
+from ..traversal import GraphTraversal
+from ..scheduler import EventScheduler
+from .connection import Connection
+from .rng import default_rng
+
+class ConnectionManager:
+    def __init__(self, scheduler=None, connection_class=Connection, rng=None):
+        self.connections = []
+        # Класс создаваемых связей: модель или наследник с отрисовкой
+        self.connection_class = connection_class
+        self.rng = rng if rng is not None else default_rng
+        # Истечение временных связей - события планировщика, а не опрос каждый кадр
+        self.scheduler = scheduler if scheduler is not None else EventScheduler()
+        # Индекс смежности: узел -> {соседний узел: связь}
+        self.adjacency = {}
+        # Таблица расстояний уровня (DistanceTable) или None
+        self.distances = None
+        # Итеративные обходы поверх индекса смежности
+        self.traversal = GraphTraversal(self.neighbors)
+        # Достижимость из стартового узла, пересчитывается только при изменениях графа
+        self.connectivity = ConnectivityTracker(self)
+        # Защита firewall и цели вирусов, обновляются по событиям
+        self.infection = InfectionIndex(self)
+        # Кэши, получающие события добавления/удаления связей и смены типа узлов
+        self.listeners = [self.connectivity, self.infection]
+        
+    def reset(self, connections=None, nodes=(), distances=None):
+        """Привязывает менеджер к списку связей, узлам и расстояниям уровня, перестраивает индекс"""
+        self.distances = distances
+        self.traversal.reset(nodes)
+        start_node = next((n for n in nodes if n.type == "start"), None)
+        self.connectivity.reset(start_node)
+        self.infection.reset()
+        
+        self.connections = connections if connections is not None else []
+        self.adjacency = {}
+        for connection in self.connections:
+            self._index_connection(connection)
+            
+    def on_node_type_changed(self, node, old_type, new_type):
+        """Передает смену типа узла кэшам графа"""
+        for listener in self.listeners:
+            listener.on_node_type_changed(node, old_type, new_type)
+            
+    def _index_connection(self, connection):
+        node1, node2 = connection.node1, connection.node2
+        self.adjacency.setdefault(node1, {})[node2] = connection
+        self.adjacency.setdefault(node2, {})[node1] = connection
+        for listener in self.listeners:
+            listener.on_connection_added(connection)
+        
+    def _unindex_connection(self, connection):
+        node1, node2 = connection.node1, connection.node2
+        links = self.adjacency.get(node1)
+        if links is not None and links.get(node2) is connection:
+            del links[node2]
+        links = self.adjacency.get(node2)
+        if links is not None and links.get(node1) is connection:
+            del links[node1]
+        for listener in self.listeners:
+            listener.on_connection_removed(connection)
+        
+    def add_connection(self, connection):
+        """Добавляет связь в список и индекс смежности"""
+        self.connections.append(connection)
+        self._index_connection(connection)
+        if connection.duration is not None:
+            connection.expiry_event = self.scheduler.schedule(
+                connection.duration * 1000, self.remove_connection, connection
+            )
+        
+    def remove_connection(self, connection):
+        """Удаляет связь; возвращает False, если ее уже нет"""
+        if self.find_connection(connection.node1, connection.node2) is not connection:
+            return False
+        self._unindex_connection(connection)
+        self._cancel_expiry(connection)
+        self.connections.remove(connection)
+        return True
+    
+    def remove_connections(self, connections):
+        """Удаляет несколько связей за один проход по списку"""
+        doomed = {conn for conn in connections
+                  if self.find_connection(conn.node1, conn.node2) is conn}
+        if not doomed:
+            return
+        for connection in doomed:
+            self._unindex_connection(connection)
+            self._cancel_expiry(connection)
+        # Изменяем список на месте: LevelManager держит ссылку на него
+        self.connections[:] = [conn for conn in self.connections if conn not in doomed]
+        
+    @staticmethod
+    def _cancel_expiry(connection):
+        if connection.expiry_event is not None:
+            connection.expiry_event.cancel()
+            connection.expiry_event = None
+        
+    def find_connection(self, node1, node2):
+        """Возвращает связь между узлами или None"""
+        links = self.adjacency.get(node1)
+        if links is None:
+            return None
+        return links.get(node2)
+    
+    def get_node_connections(self, node):
+        """Возвращает все связи узла"""
+        return self.adjacency.get(node, {}).values()
+    
+    def neighbors(self, node):
+        """Соседи узла по активным связям (истекшие удаляются планировщиком)"""
+        return self.adjacency.get(node, {}).keys()
+        
+    def get_distance(self, node1, node2):
+        """Расстояние между узлами из таблицы уровня; без нее - по координатам"""
+        if self.distances is not None:
+            return self.distances.distance(node1, node2)
+        return ((node1.x - node2.x) ** 2 + (node1.y - node2.y) ** 2) ** 0.5
+        
+    def connection_exists(self, node1, node2):
+        return self.find_connection(node1, node2) is not None
+        
+    def create_connection(self, node1, node2, connection_type, agent, player_energy, max_length=250, duration=None):
+        """Создает соединение и возвращает новую энергию"""
+        # Узел нельзя соединить с самим собой
+        if node1 is node2:
+            return player_energy, "Нельзя соединить узел с самим собой!"
+            
+        # Проверяем расстояние
+        distance = self.get_distance(node1, node2)
+        if distance > max_length:  # Используем переданный параметр
+            return player_energy, "Слишком длинная связь! Макс: {}px".format(max_length)
+            
+        # Запрещаем прямое соединение старта и финиша
+        if (node1.type == "start" and node2.type == "finish") or (node1.type == "finish" and node2.type == "start"):
+            return player_energy, "Нельзя соединять старт и финиш напрямую!"
+        
+        connection_type, cost = self.get_connection_cost(node1, node2, connection_type, agent)
+        
+        if player_energy >= cost and not self.connection_exists(node1, node2):
+            self.add_connection(self.connection_class(
+                node1, node2, connection_type, duration, self.scheduler, self.rng, distance
+            ))
+            return player_energy - cost, "Связь создана!"
+        
+        return player_energy, "Недостаточно энергии или связь уже существует"
+    
+    @staticmethod
+    def get_connection_cost(node1, node2, connection_type, agent):
+        """Итоговый тип связи между узлами и ее стоимость"""
+        # Специальные правила для новых типов узлов
+        if node1.type == "firewall" or node2.type == "firewall":
+            # Firewall блокирует вирусы, но стоит дороже
+            if connection_type == "normal":
+                connection_type = "firewall"
+        
+        # Amplifier снижает стоимость связей на 30%
+        cost_multiplier = 1.0
+        if node1.type == "amplifier" or node2.type == "amplifier":
+            cost_multiplier = 0.7
+            
+        return connection_type, int(agent.get_connection_cost(connection_type) * cost_multiplier)
+    
+    def update_connections(self, dt):
+        """Обновляет анимации связей"""
+        for connection in self.connections:
+            connection.update(dt)
+    
+    def has_backup_path(self, start, finish):
+        """Проверяет, есть ли хотя бы два разных пути от start до finish.
+        
+        Путь единственный тогда и только тогда, когда каждая связь на нем -
+        мост. Поэтому достаточно найти мосты (алгоритм Тарьяна) и пройти
+        по дереву обхода от finish к start: это O(V + E) вместо перебора
+        всех путей.
+        """
+        if start == finish or start.type == "virus":
+            return False
+        
+        def passable(node):
+            # Через зараженные узлы путь не проходит, финиш - только конец пути
+            return node.type != "virus" or node == finish
+        
+        order = {start: 0}
+        low = {start: 0}
+        parent = {start: None}
+        bridges = set()
+        stack = [(start, iter(self.neighbors(start)))]
+        while stack:
+            node, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if not passable(neighbor):
+                    continue
+                if neighbor not in order:
+                    order[neighbor] = low[neighbor] = len(order)
+                    parent[neighbor] = node
+                    stack.append((neighbor, iter(self.neighbors(neighbor))))
+                    break
+                if neighbor != parent[node]:
+                    low[node] = min(low[node], order[neighbor])
+            else:
+                stack.pop()
+                above = parent[node]
+                if above is not None:
+                    low[above] = min(low[above], low[node])
+                    if low[node] > order[above]:
+                        bridges.add(self.find_connection(above, node))
+        
+        if finish not in order:
+            return False
+        
+        node = finish
+        while parent[node] is not None:
+            if self.find_connection(parent[node], node) not in bridges:
+                return True
+            node = parent[node]
+        return False
@@ -0,0 +1,207 @@
+"""Оценка сложности уровней методом Монте-Карло.
+
+Тысячи партий без окна на каждом уровне: бот BaselineBot играет через
+SinapsisEnv, партии раздаются процессам ProcessPoolExecutor пачками,
+результаты каждой партии сразу дописываются в JSONL. В конце - доля
+побед, распределение звезд и перцентили времени до победы по уровням.
+
+    python -m game.sim.difficulty --levels 1-10 --runs 2000 --out runs.jsonl
+
+Партия воспроизводится по записи: SinapsisEnv().reset(level, seed)
+и тот же бот дают ту же игру.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from ..levels import get_level_numbers
+from .env import SinapsisEnv, WAIT_ACTION, CONNECT, DESTROY, get_max_nodes
+from .simulation import GameState
+
+TIME_PERCENTILES = (10, 50, 90)
+
+
+class BaselineBot:
+    """Жадный бот: тянет сеть от старта к финишу.
+
+    Бесплатно уничтожает изолированные вирусы, а из связей выбирает ту,
+    что присоединяет к сети узел, ближайший к финишу. Антивирус и
+    усиленные связи не использует - это нижняя планка для игрока.
+    Между действиями проходит время реакции (мс) - как у человека,
+    иначе бот успевал бы до первого хода вирусов.
+    """
+
+    def __init__(self, seed=None, reaction=(800, 2000)):
+        self.rng = random.Random(f"{seed}:bot")
+        self.reaction = reaction
+        self.next_action_time = self.rng.uniform(*reaction)
+
+    def act(self, env, legal):
+        sim = env.sim
+        if sim.scheduler.time < self.next_action_time:
+            return WAIT_ACTION
+        action = self.choose(sim, legal)
+        if action != WAIT_ACTION:
+            self.next_action_time = sim.scheduler.time + self.rng.uniform(*self.reaction)
+        return action
+
+    def choose(self, sim, legal):
+        nodes = sim.level_manager.nodes
+        finish = sim.level_manager.get_node("finish")
+        connectivity = sim.connection_manager.connectivity
+        best, best_distance = WAIT_ACTION, math.inf
+        for action in legal:
+            kind, i, j = action
+            if kind == DESTROY:
+                if sim.is_isolated(nodes[i]):
+                    return action
+            elif kind == CONNECT and finish is not None:
+                a, b = nodes[i], nodes[j]
+                # Полезна только связь на границе сети: один конец уже достижим
+                if connectivity.is_reachable(a) == connectivity.is_reachable(b):
+                    continue
+                new = b if connectivity.is_reachable(a) else a
+                distance = sim.level_manager.distances.distance(new, finish)
+                if distance < best_distance:
+                    best, best_distance = action, distance
+        return best
+
+
+def play(level, seed, step_ms=100, max_time=300.0, max_nodes=None):
+    """Одна партия бота; итог - словарь для строки JSONL.
+
+    max_nodes - ширина наблюдений; по умолчанию - по размеру самого уровня.
+    """
+    env = SinapsisEnv(step_ms, max_nodes)
+    env.reset(level, seed)
+    bot = BaselineBot(seed)
+    done = False
+    steps = 0
+    info = {"state": GameState.PLAYING, "stars": 0, "time": 0}
+    while not done and env.sim.scheduler.time < max_time * 1000:
+        _, _, done, info = env.step(bot.act(env, env.legal_actions()))
+        steps += 1
+    return {
+        "level": level,
+        "seed": seed,
+        # Бот застрял (нет энергии на уровне без лимита времени)
+        "state": info["state"] if done else "timeout",
+        "stars": info["stars"],
+        "time": info["time"] / 1000.0,
+        "energy": env.sim.player_energy,
+        "steps": steps,
+    }
+
+
+def play_batch(level, seeds, step_ms=100, max_time=300.0, max_nodes=None):
+    """Пачка партий в одном процессе: меньше пересылок между процессами"""
+    return [play(level, seed, step_ms, max_time, max_nodes) for seed in seeds]
+
+
+def summarize(records):
+    """Сводка по уровням: {уровень: {runs, win_rate, stars, time_to_win}}"""
+    by_level = {}
+    for record in records:
+        by_level.setdefault(record["level"], []).append(record)
+    summary = {}
+    for level, level_records in sorted(by_level.items()):
+        win_times = [r["time"] for r in level_records if r["state"] == GameState.WIN]
+        stars = [0] * 6
+        for record in level_records:
+            stars[record["stars"]] += 1
+        summary[level] = {
+            "runs": len(level_records),
+            "win_rate": len(win_times) / len(level_records),
+            "stars": stars,
+            "time_to_win": dict(zip(
+                TIME_PERCENTILES,
+                np.percentile(win_times, TIME_PERCENTILES).tolist() if win_times
+                else [None] * len(TIME_PERCENTILES)
+            )),
+        }
+    return summary
+
+
+def format_summary(summary):
+    lines = ["Уровень  Партий  Победы  Звезды 0-5                  "
+             + "  ".join(f"p{p} победы" for p in TIME_PERCENTILES)]
+    for level, row in summary.items():
+        stars = " ".join(f"{count:4d}" for count in row["stars"])
+        times = "  ".join(
+            f"{value:8.1f}с" if value is not None else "         -"
+            for value in row["time_to_win"].values()
+        )
+        lines.append(f"{level:7d}  {row['runs']:6d}  {row['win_rate']:6.1%}  {stars}  {times}")
+    return "\n".join(lines)
+
+
+def parse_levels(text):
+    """'1-3,7' -> [1, 2, 3, 7]"""
+    levels = []
+    for part in text.split(","):
+        first, _, last = part.partition("-")
+        levels.extend(range(int(first), int(last or first) + 1))
+    return levels
+
+
+def run(levels, runs, seed=0, workers=None, chunk=25, out=None, step_ms=100, max_time=300.0):
+    """Раздает партии процессам; записи идут в out по мере готовности"""
+    tasks = []
+    for level in levels:
+        seeds = [f"{seed}:{level}:{k}" for k in range(runs)]
+        for start in range(0, runs, chunk):
+            tasks.append((level, seeds[start:start + chunk]))
+
+    # Одна ширина наблюдений на весь прогон - по самому большому уровню
+    max_nodes = get_max_nodes(levels)
+    records = []
+    if out and os.path.dirname(out):
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+    out_file = open(out, "w", encoding="utf-8") if out else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(play_batch, level, batch, step_ms, max_time, max_nodes)
+                       for level, batch in tasks]
+            for future in as_completed(futures):
+                batch_records = future.result()
+                records.extend(batch_records)
+                if out_file:
+                    for record in batch_records:
+                        out_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out_file.flush()
+    finally:
+        if out_file:
+            out_file.close()
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Оценка сложности уровней Синапсиса")
+    parser.add_argument("--levels", default=None, help="например 1-10 или 2,5,8; по умолчанию все")
+    parser.add_argument("--runs", type=int, default=1000, help="партий на уровень")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=25, help="партий в одной задаче процесса")
+    parser.add_argument("--out", default=os.path.join("out", "difficulty.jsonl"),
+                        help="файл JSONL с итогами партий")
+    parser.add_argument("--step-ms", type=float, default=100, help="как часто бот принимает решение")
+    parser.add_argument("--max-time", type=float, default=300.0, help="лимит партии, с игры")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    levels = parse_levels(args.levels) if args.levels else get_level_numbers()
+    records = run(levels, args.runs, args.seed, args.workers,
+                  args.chunk, args.out, args.step_ms, args.max_time)
+    elapsed = time.perf_counter() - started
+    print(format_summary(summarize(records)))
+    print(f"{len(records)} партий за {elapsed:.1f}с ({len(records) / elapsed:.0f} партий/с)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+import random
+
+import numpy as np
+
+from ..levels import get_level
+from .simulation import FIXED_DT, GameState, Simulation
+
+# Коды типов узлов в наблюдениях; -1 - пустая ячейка (узла с таким номером нет)
+NODE_TYPES = ("neutral", "start", "finish", "virus", "firewall", "amplifier", "decoy", "codex")
+NODE_CODES = {name: code for code, name in enumerate(NODE_TYPES)}
+# В матрице смежности 0 - нет связи, иначе номер типа связи + 1
+CONNECTION_TYPES = ("normal", "enhanced", "temporary", "firewall")
+CONNECTION_CODES = {name: code + 1 for code, name in enumerate(CONNECTION_TYPES)}
+
+# Действие - кортеж (вид, i, j) с номерами узлов в порядке уровня
+WAIT, CONNECT, CONNECT_ENHANCED, DESTROY = range(4)
+WAIT_ACTION = (WAIT, 0, 0)
+
+
+def get_max_nodes(levels):
+    """Число узлов самого большого из уровней levels.
+
+    Загружает только эти уровни; ширина под все уровни реестра, включая
+    паки, - get_max_nodes(get_level_numbers()).
+    """
+    return max((len(get_level(level)["nodes"]) for level in levels), default=0)
+
+
+def make_observation(num_envs, max_nodes):
+    """Массивы наблюдений для num_envs игр; строка row принадлежит игре row"""
+    return {
+        "node_types": np.full((num_envs, max_nodes), -1, dtype=np.int8),
+        "node_positions": np.zeros((num_envs, max_nodes, 2), dtype=np.float32),
+        "adjacency": np.zeros((num_envs, max_nodes, max_nodes), dtype=np.int8),
+        "energy": np.zeros(num_envs, dtype=np.int32),
+        "time_left": np.zeros(num_envs, dtype=np.float32),   # с, 0 - без лимита
+        "wave_in": np.zeros(num_envs, dtype=np.float32),     # мс до следующей волны
+        "wave_progress": np.zeros(num_envs, dtype=np.float32),
+        "sim_time": np.zeros(num_envs, dtype=np.float64),    # мс с начала уровня
+    }
+
+
+class ObservationWriter:
+    """Держит строку наблюдений в актуальном состоянии.
+
+    Подписан на события ConnectionManager так же, как кэши графа, поэтому
+    шаг среды не перестраивает матрицы из объектов, а меняет только
+    ячейки добавленных и удаленных связей и зараженных узлов.
+    """
+
+    def __init__(self, observation, row):
+        self.observation = observation
+        self.row = row
+
+    def reset(self, sim):
+        row = self.row
+        node_types = self.observation["node_types"][row]
+        positions = self.observation["node_positions"][row]
+        node_types.fill(-1)
+        positions.fill(0)
+        self.observation["adjacency"][row].fill(0)
+        for node in sim.level_manager.nodes:
+            node_types[node.index] = NODE_CODES[node.type]
+            positions[node.index] = (node.x, node.y)
+        for connection in sim.connection_manager.connections:
+            self.on_connection_added(connection)
+        self.update(sim)
+
+    def update(self, sim):
+        """Скалярные поля меняются каждый тик - их просто переписываем"""
+        row = self.row
+        silence = sim.silence
+        self.observation["energy"][row] = sim.player_energy
+        self.observation["time_left"][row] = max(0.0, sim.time_left)
+        self.observation["wave_in"][row] = silence.next_wave_time - silence.wave_timer
+        self.observation["wave_progress"][row] = silence.wave_progress
+        self.observation["sim_time"][row] = sim.scheduler.time
+
+    def on_connection_added(self, connection):
+        i, j = connection.node1.index, connection.node2.index
+        code = CONNECTION_CODES[connection.type]
+        adjacency = self.observation["adjacency"][self.row]
+        adjacency[i, j] = code
+        adjacency[j, i] = code
+
+    def on_connection_removed(self, connection):
+        i, j = connection.node1.index, connection.node2.index
+        adjacency = self.observation["adjacency"][self.row]
+        adjacency[i, j] = 0
+        adjacency[j, i] = 0
+
+    def on_node_type_changed(self, node, old_type, new_type):
+        self.observation["node_types"][self.row, node.index] = NODE_CODES[new_type]
+
+
+class SinapsisEnv:
+    """Среда в стиле Gym для ботов: reset / step / legal_actions без окна.
+
+    Действия: (WAIT, 0, 0), (CONNECT, i, j) и (CONNECT_ENHANCED, i, j) -
+    связь между узлами i и j, (DESTROY, i, 0) - уничтожить вирус в узле i.
+    Недопустимое действие ничего не делает (info["applied"] == False).
+    Шаг среды - step_ms миллисекунд игры тиками FIXED_DT, как в окне.
+    Награда - число звезд при победе, -1 при поражении, иначе 0.
+    Наблюдение - словарь массивов NumPy; массивы обновляются на месте.
+    Без max_nodes ширина наблюдений берется по уровню первого reset:
+    чтобы потом играть уровни крупнее, max_nodes нужно передать.
+    """
+
+    def __init__(self, step_ms=100, max_nodes=None, observation=None, row=0):
+        self.ticks = max(1, round(step_ms / FIXED_DT))
+        # Наблюдения можно держать в общих массивах векторной среды
+        self.observation = observation
+        if observation is not None:
+            max_nodes = observation["node_types"].shape[1]
+        self.max_nodes = max_nodes
+        self.row = row
+        self.sim = None
+        self.writer = None
+        self.level = 1
+        # Пары узлов (i, j), i < j, которые можно соединить по длине (из DistanceTable)
+        self.pairs = []
+
+    def reset(self, level=1, seed=None):
+        """Начинает уровень заново; одно зерно и одни действия дают одну партию"""
+        if seed is None:
+            # load_level с зерном начинает партию с нуля - нужно и случайной
+            seed = random.randrange(2 ** 63)
+        if self.observation is None:
+            if self.max_nodes is None:
+                self.max_nodes = get_max_nodes([level])
+            self.observation = make_observation(1, self.max_nodes)
+        if self.sim is None:
+            self.sim = Simulation(seed)
+            self.writer = ObservationWriter(self.observation, self.row)
+            self.sim.connection_manager.listeners.append(self.writer)
+        self.sim.load_level(level, seed)
+        self.level = self.sim.level_manager.current_level
+
+        nodes = self.sim.level_manager.nodes
+        if len(nodes) > self.max_nodes:
+            raise ValueError(f"На уровне {self.level} {len(nodes)} узлов, max_nodes={self.max_nodes}")
+        self.writer.reset(self.sim)
+
+        self.pairs = [tuple(edge) for edge in self.sim.level_manager.distances.edges.tolist()]
+        return self.get_observation()
+
+    def get_observation(self):
+        return {name: array[self.row] for name, array in self.observation.items()}
+
+    def step(self, action):
+        """Применяет действие и продвигает игру; (наблюдение, награда, конец, info)"""
+        reward, done, info = self._advance(action)
+        return self.get_observation(), reward, done, info
+
+    def _advance(self, action):
+        sim = self.sim
+        applied = False
+        reward = 0
+        if sim.game_state == GameState.PLAYING:
+            applied = self.apply(action)
+            for _ in range(self.ticks):
+                sim.step(FIXED_DT)
+                if sim.game_state != GameState.PLAYING:
+                    # Награда начисляется один раз - на шаге, где игра закончилась
+                    reward = sim.stars_earned if sim.game_state == GameState.WIN else -1
+                    break
+        self.writer.update(sim)
+        info = {
+            "state": sim.game_state,
+            "stars": sim.stars_earned,
+            "time": sim.scheduler.time,
+            "applied": applied,
+        }
+        return reward, sim.game_state != GameState.PLAYING, info
+
+    def apply(self, action):
+        """Выполняет действие без хода времени; True, если оно что-то изменило"""
+        kind, i, j = action
+        sim = self.sim
+        nodes = sim.level_manager.nodes
+        # Номера проверяются до индексации: -1 не должен стать последним узлом
+        if not (0 <= i < len(nodes) and 0 <= j < len(nodes)):
+            return False
+        if kind in (CONNECT, CONNECT_ENHANCED) and i == j:
+            return False
+        if kind == CONNECT:
+            return sim.create_connection(nodes[i], nodes[j])
+        if kind == CONNECT_ENHANCED:
+            if not sim.agent.can_use_enhanced_connections():
+                return False
+            return sim.create_connection(nodes[i], nodes[j], enhanced=True)
+        if kind == DESTROY:
+            return nodes[i].type == "virus" and sim.destroy_virus(nodes[i])
+        return False
+
+    def legal_actions(self):
+        """Действия, которые сейчас что-то изменят (плюс WAIT)"""
+        actions = [WAIT_ACTION]
+        sim = self.sim
+        if sim.game_state != GameState.PLAYING:
+            return actions
+
+        kinds = [(CONNECT, sim.get_connection_type()[0])]
+        enhanced_type = sim.get_connection_type(enhanced=True)[0]
+        if sim.agent.can_use_enhanced_connections() and enhanced_type == "enhanced":
+            kinds.append((CONNECT_ENHANCED, enhanced_type))
+
+        nodes = sim.level_manager.nodes
+        connection_manager = sim.connection_manager
+        for i, j in self.pairs:
+            a, b = nodes[i], nodes[j]
+            if a.type == "virus" or b.type == "virus":
+                continue
+            if (a.type, b.type) in (("start", "finish"), ("finish", "start")):
+                continue
+            if connection_manager.connection_exists(a, b):
+                continue
+            for kind, connection_type in kinds:
+                cost = connection_manager.get_connection_cost(a, b, connection_type, sim.agent)[1]
+                if sim.player_energy >= cost:
+                    actions.append((kind, i, j))
+
+        for node in sim.level_manager.get_nodes("virus"):
+            if sim.can_destroy_virus(node):
+                actions.append((DESTROY, node.index, 0))
+        return actions
+
+
+class VectorEnv:
+    """num_envs независимых игр, которые шагают синхронно.
+
+    Наблюдения - общие массивы формы (num_envs, ...), каждая игра пишет
+    в свою строку. Закончившаяся игра сразу начинается заново на том же
+    уровне со следующим зерном; итог партии остается в infos.
+    Без max_nodes массивы создаются при первом reset по самому большому
+    из переданных уровней.
+    """
+
+    def __init__(self, num_envs, step_ms=100, max_nodes=None):
+        self.num_envs = num_envs
+        self.step_ms = step_ms
+        self.observation = None
+        self.envs = []
+        if max_nodes is not None:
+            self._make_envs(max_nodes)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self.levels = [1] * num_envs
+        self.seed = None
+        self.episodes = [0] * num_envs
+
+    def _make_envs(self, max_nodes):
+        self.observation = make_observation(self.num_envs, max_nodes)
+        self.envs = [SinapsisEnv(self.step_ms, max_nodes, self.observation, row)
+                     for row in range(self.num_envs)]
+
+    def episode_seed(self, row):
+        """Зерно очередной партии игры row: разное для игр и партий"""
+        if self.seed is None:
+            return None
+        return f"{self.seed}:{row}:{self.episodes[row]}"
+
+    def reset(self, levels=1, seed=None):
+        """levels - номер уровня для всех игр или по номеру на игру"""
+        if isinstance(levels, int):
+            levels = [levels] * self.num_envs
+        if len(levels) != self.num_envs:
+            raise ValueError(f"Нужно {self.num_envs} уровней, передано {len(levels)}")
+        self.levels = list(levels)
+        if self.observation is None:
+            self._make_envs(get_max_nodes(set(self.levels)))
+        self.seed = seed
+        self.episodes = [0] * self.num_envs
+        for row, env in enumerate(self.envs):
+            env.reset(self.levels[row], self.episode_seed(row))
+        return self.observation
+
+    def step(self, actions):
+        """Одно действие на игру; (наблюдения, награды, концы, infos)"""
+        infos = []
+        for row, env in enumerate(self.envs):
+            reward, done, info = env._advance(actions[row])
+            if done:
+                self.episodes[row] += 1
+                env.reset(self.levels[row], self.episode_seed(row))
+            self.rewards[row] = reward
+            self.dones[row] = done
+            infos.append(info)
+        return self.observation, self.rewards, self.dones, infos
+
+    def legal_actions(self):
+        return [env.legal_actions() for env in self.envs]
@@ -0,0 +1,85 @@
+from ..levels import get_level
+from ..spatial import SpatialGrid, DistanceTable
+from ..virus_swarm import VirusSwarm
+from .node import Node
+from .virus import Virus
+from .rng import default_rng
+
+class LevelManager:
+    def __init__(self, agent, node_class=Node, virus_class=Virus, rng=None):
+        self.agent = agent
+        self.rng = rng if rng is not None else default_rng
+        # Классы узлов и вирусов: модель или наследники с отрисовкой
+        self.node_class = node_class
+        self.virus_class = virus_class
+        self.current_level = 1
+        self.nodes = []
+        self.connections = []
+        self.viruses = []
+        self.virus_swarm = VirusSwarm()
+        self.player_energy = 0
+        self.level_config = None
+        self.node_grid = SpatialGrid()
+        # Попарные расстояния и допустимые по длине пары узлов уровня
+        self.distances = DistanceTable()
+        # Реестр узлов по типам: тип -> {узел: None} в порядке добавления
+        self.nodes_by_type = {}
+        # Подписчики на смену типа любого узла уровня
+        self.type_listeners = []
+        
+    def load_level(self, level_num):
+        try:
+            self.level_config = get_level(level_num)
+            self.current_level = level_num
+        except Exception as e:
+            print(f"Ошибка загрузки уровня {level_num}: {e}")
+            self.level_config = get_level(1)
+            self.current_level = 1
+            
+        self.nodes = []
+        self.nodes_by_type = {}
+        for index, node_data in enumerate(self.level_config["nodes"]):
+            node = self.node_class(**node_data)
+            node.index = index
+            self.nodes.append(node)
+            self.nodes_by_type.setdefault(node.type, {})[node] = None
+            node.add_type_listener(self._on_node_type_changed)
+        
+        # Узлы не двигаются, поэтому сетку для поиска под курсором строим один раз
+        self.node_grid.rebuild(self.nodes)
+        self.distances.rebuild(self.nodes, self.level_config.get("max_connection_length", 250))
+            
+        self.player_energy = self.level_config["start_energy"]
+        self.connections = []
+        self.viruses = []
+        
+        # Инициализируем вирусы, их таймеры и состояние - в общем рое
+        self.virus_swarm = VirusSwarm()
+        for node in self.get_nodes("virus"):
+            self.viruses.append(self.virus_class(node, self.virus_swarm, self.rng))
+                
+        return self.level_config
+    
+    def node_at(self, pos):
+        """Узел под курсором или None"""
+        return self.node_grid.node_at(pos)
+    
+    def get_nodes(self, node_type):
+        """Все узлы данного типа за O(1)"""
+        return self.nodes_by_type.get(node_type, {}).keys()
+    
+    def get_node(self, node_type):
+        """Первый узел данного типа или None"""
+        return next(iter(self.get_nodes(node_type)), None)
+    
+    def add_type_listener(self, listener):
+        """Подписывает listener(node, old_type, new_type) на смену типа узлов уровня"""
+        self.type_listeners.append(listener)
+        
+    def _on_node_type_changed(self, node, old_type, new_type):
+        nodes = self.nodes_by_type.get(old_type)
+        if nodes is not None:
+            nodes.pop(node, None)
+        self.nodes_by_type.setdefault(new_type, {})[node] = None
+        for listener in self.type_listeners:
+            listener(node, old_type, new_type)
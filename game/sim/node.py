@@ -0,0 +1,39 @@
+class Node:
+    def __init__(self, x, y, type="neutral"):
+        self.x = x
+        self.y = y
+        self.radius = 20
+        self.index = None  # Номер узла на уровне, задается при загрузке
+        self.type_listeners = []
+        self._type = type
+        self.connected_to = []
+        self.selected = False
+        self.pulse = 0.0
+        self.animation_time = 0.0
+        
+    @property
+    def type(self):
+        return self._type
+    
+    @type.setter
+    def type(self, value):
+        old_type = self._type
+        self._type = value
+        if old_type != value:
+            # Оповещаем подписчиков (кэши графа) о смене типа
+            for listener in self.type_listeners:
+                listener(self, old_type, value)
+    
+    def add_type_listener(self, listener):
+        """Подписывает listener(node, old_type, new_type) на смену типа узла"""
+        self.type_listeners.append(listener)
+        
+    def update(self, dt):
+        # Плавная пульсация для всех узлов
+        self.pulse = (self.pulse + dt / 1000.0) % 1.0
+        self.animation_time += dt / 1000.0
+    
+    def is_clicked(self, pos):
+        dx = self.x - pos[0]
+        dy = self.y - pos[1]
+        return dx * dx + dy * dy <= self.radius * self.radius
@@ -0,0 +1,218 @@
+"""Планировщик самого дешевого по энергии пути от старта до финиша.
+
+Дейкстра по графу допустимых связей: вес ребра - стоимость связи по
+правилам ConnectionManager (скидка усилителя, удорожание у firewall,
+Agent.get_connection_cost), уже построенные связи бесплатны. Путь через
+вирус включает его уничтожение: изолированный вирус снимается даром,
+остальные - антивирусом за ANTIVIRUS_COST, если он открыт. Допустимые
+по длине пары узлов берутся из таблицы расстояний уровня
+(LevelManager.distances), поэтому подсказка строится быстрее миллисекунды.
+
+Тот же планировщик проверяет поставляемые уровни:
+
+    python -m game.sim.planner
+"""
+import heapq
+import math
+
+from ..levels import get_level_numbers
+from .simulation import ANTIVIRUS_COST, Simulation
+
+
+class Route:
+    """Найденный путь: узлы по порядку, связи, которые нужно построить,
+    вирусы, которые нужно уничтожить, и общая цена"""
+
+    def __init__(self, path, links, cleared, cost):
+        self.path = path
+        self.links = links
+        self.cleared = cleared
+        self.cost = cost
+
+
+class RoutePlanner:
+    def __init__(self, sim):
+        self.sim = sim
+        # Узлы уровня, для которого посчитаны кандидаты: смена списка - новый уровень
+        self.nodes = None
+        # Номер узла -> [(соседний узел, номер соседа)] в пределах max_connection_length
+        self.candidates = []
+
+    def _prepare(self):
+        nodes = self.sim.level_manager.nodes
+        if nodes is self.nodes:
+            return
+        self.nodes = nodes
+        self.candidates = [
+            [(nodes[j], j) for j in neighbors]
+            for neighbors in self.sim.level_manager.distances.neighbors
+        ]
+
+    def edge_cost(self, a, b, connection_type):
+        """Цена связи a-b сейчас; None, если ее нельзя построить"""
+        connection_manager = self.sim.connection_manager
+        if connection_manager.connection_exists(a, b):
+            return 0
+        # Прямое соединение старта и финиша запрещено
+        if (a.type, b.type) in (("start", "finish"), ("finish", "start")):
+            return None
+        return connection_manager.get_connection_cost(a, b, connection_type, self.sim.agent)[1]
+
+    def clear_cost(self, node):
+        """Цена уничтожения вируса в узле; None, если его не снять"""
+        if self.sim.is_isolated(node):
+            return 0
+        if self.sim.agent.can_use_antivirus():
+            return ANTIVIRUS_COST
+        return None
+
+    def plan(self, enhanced=False):
+        """Самый дешевый путь от старта до финиша или None"""
+        self._prepare()
+        level_manager = self.sim.level_manager
+        start = level_manager.get_node("start")
+        finish = level_manager.get_node("finish")
+        if start is None or finish is None:
+            return None
+        connection_type = self.sim.get_connection_type(enhanced)[0]
+        return self._search(start, finish, connection_type)
+
+    def plan_backup(self, route, enhanced=False):
+        """Самые дешевые дополнительные связи для второго пути; цена - сверх route.
+
+        Критерий тот же, что у ConnectionManager.has_backup_path: второй
+        путь есть, если хотя бы одна связь маршрута не мост. Поэтому для
+        каждой связи a-b маршрута ищется обход от a до b без нее, где связи
+        и вирусы маршрута уже оплачены, и берется самый дешевый. None -
+        второго пути не построить.
+        """
+        self._prepare()
+        connection_type = self.sim.get_connection_type(enhanced)[0]
+        steps = list(zip(route.path, route.path[1:]))
+        free = {frozenset(pair) for pair in steps}
+        best = None
+        for a, b in steps:
+            detour = self._search(a, b, connection_type, free, route.cleared, frozenset((a, b)))
+            if detour is not None and (best is None or detour.cost < best.cost):
+                best = detour
+        return best
+
+    def _search(self, source, target, connection_type, free=(), paid=(), banned=None):
+        """Дейкстра от source до target.
+
+        free - пары узлов, связь между которыми уже оплачена, paid - уже
+        уничтоженные вирусы, banned - пара, которую использовать нельзя.
+        В Route попадают только связи и вирусы сверх уже оплаченных.
+        """
+        level_manager = self.sim.level_manager
+        connection_manager = self.sim.connection_manager
+        nodes = self.nodes
+        index = {node: i for i, node in enumerate(nodes)}
+        clear_costs = {node: self.clear_cost(node) for node in level_manager.get_nodes("virus")}
+        for node in paid:
+            clear_costs[node] = 0
+
+        costs = [math.inf] * len(nodes)
+        parents = [None] * len(nodes)
+        source_index = index[source]
+        costs[source_index] = 0
+        queue = [(0, source_index)]
+        while queue:
+            cost, i = heapq.heappop(queue)
+            if cost > costs[i]:
+                continue
+            node = nodes[i]
+            if node is target:
+                break
+            for neighbor, j in self.candidates[i]:
+                pair = frozenset((node, neighbor))
+                if pair == banned:
+                    continue
+                edge = 0 if pair in free else self.edge_cost(node, neighbor, connection_type)
+                if edge is None:
+                    continue
+                # В вирус путь заходит только вместе с его уничтожением
+                if neighbor.type == "virus":
+                    clear = clear_costs.get(neighbor)
+                    if clear is None:
+                        continue
+                    edge += clear
+                if cost + edge < costs[j]:
+                    costs[j] = cost + edge
+                    parents[j] = i
+                    heapq.heappush(queue, (cost + edge, j))
+
+        target_index = index[target]
+        if costs[target_index] == math.inf:
+            return None
+        path = [target]
+        while parents[index[path[-1]]] is not None:
+            path.append(nodes[parents[index[path[-1]]]])
+        path.reverse()
+        links = [(a, b) for a, b in zip(path, path[1:])
+                 if frozenset((a, b)) not in free and not connection_manager.connection_exists(a, b)]
+        cleared = [node for node in path if node.type == "virus" and node not in paid]
+        return Route(path, links, cleared, costs[target_index])
+
+
+def solve_level(level_num):
+    """Достижимость звезд уровня при самом дешевом построении сети"""
+    sim = Simulation(seed=0)
+    level_config = sim.load_level(level_num)
+    planner = RoutePlanner(sim)
+    start_energy = level_config["start_energy"]
+    energy_bonus = level_config.get("energy_bonus", 0.3)
+    max_connections = level_config.get("max_connections")
+    result = {
+        "level": level_num,
+        "name": level_config.get("name", ""),
+        "start_energy": start_energy,
+        "route": None,
+        "backup": None,
+        "max_stars": 0,
+    }
+    route = planner.plan()
+    if route is None or route.cost > start_energy:
+        return result
+    result["route"] = route
+
+    # Без лимита времени звезда за время не дается; с лимитом сеть строится сразу
+    timed = level_config.get("time_limit", 0) > 0
+    options = [(route.cost, len(route.links), False)]
+    backup = planner.plan_backup(route)
+    result["backup"] = backup
+    if backup is not None and route.cost + backup.cost <= start_energy:
+        options.append((route.cost + backup.cost, len(route.links) + len(backup.links), True))
+    for cost, links, has_backup in options:
+        stars = 1 + timed + has_backup
+        stars += (start_energy - cost) / start_energy >= energy_bonus
+        stars += bool(max_connections) and links <= max_connections
+        result["max_stars"] = max(result["max_stars"], stars)
+    return result
+
+
+def format_solution(result):
+    """Строка таблицы; запасной путь - цена сверх основного, в скобках - не хватает энергии"""
+    route = result["route"]
+    if route is None:
+        return f"{result['level']:7d}  {result['start_energy']:7d}  пути нет"
+    backup = result["backup"]
+    if backup is None:
+        backup_text = "-"
+    elif route.cost + backup.cost <= result["start_energy"]:
+        backup_text = f"+{backup.cost}"
+    else:
+        backup_text = f"(+{backup.cost})"
+    left = (result["start_energy"] - route.cost) / result["start_energy"]
+    return (f"{result['level']:7d}  {result['start_energy']:7d}  {route.cost:4d}  "
+            f"{len(route.links):5d}  {left:8.0%}  {backup_text:>7}  {result['max_stars']:5d}")
+
+
+def main():
+    print("Уровень  Энергия  Цена  Связи  Остаток  Запасной  Звезд")
+    for level_num in get_level_numbers():
+        print(format_solution(solve_level(level_num)))
+
+
+if __name__ == "__main__":
+    main()
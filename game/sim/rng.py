@@ -0,0 +1,30 @@
+import random
+
+
+class RandomStreams:
+    """Независимые генераторы случайных чисел для подсистем.
+    
+    Все потоки выводятся из одного зерна, но не влияют друг на друга:
+    лишняя частица эффекта не меняет поведение вирусов. Одно и то же
+    зерно и одни и те же действия игрока дают одну и ту же партию.
+    """
+    
+    NAMES = ("virus", "silence", "effects")
+    
+    def __init__(self, seed=None):
+        self.virus = random.Random()
+        self.silence = random.Random()
+        self.effects = random.Random()
+        self.seed(seed)
+        
+    def seed(self, seed=None):
+        """Пересевает все потоки; None - случайное зерно"""
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.current_seed = seed
+        for name in self.NAMES:
+            getattr(self, name).seed(f"{seed}:{name}")
+
+
+# Потоки по умолчанию для объектов, созданных вне Simulation
+default_rng = RandomStreams()
@@ -0,0 +1,93 @@
+from .rng import default_rng
+
+class Silence:
+    # Скорость волны: доля экрана за мс (прежние 0.015 за кадр при 60 FPS)
+    WAVE_SPEED = 0.9 / 1000.0
+    
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else default_rng
+        self.wave_interval = 30000
+        self.wave_active = False
+        self.wave_pending = False
+        self.wave_progress = 0.0
+        self.next_wave_time = 0
+        self.cycle_start = 0  # Время планировщика, с которого идет отсчет до волны
+        self.scheduler = None
+        self.connection_manager = None
+        self.wave_event = None
+        self.reset()
+        
+    def reset(self):
+        """Сброс состояния при загрузке нового уровня"""
+        self.wave_active = False
+        self.wave_pending = False
+        self.wave_progress = 0.0
+        self.next_wave_time = self.wave_interval
+        self.cycle_start = self.scheduler.time if self.scheduler else 0
+        if self.scheduler:
+            self.schedule_wave()
+        
+    @property
+    def wave_timer(self):
+        """Сколько прошло с начала отсчета до следующей волны"""
+        if self.scheduler is None:
+            return 0
+        return self.scheduler.time - self.cycle_start
+        
+    def start(self, scheduler, connection_manager):
+        """Регистрирует отсчет до следующей волны в планировщике"""
+        self.scheduler = scheduler
+        self.connection_manager = connection_manager
+        self.schedule_wave()
+        
+    def schedule_wave(self):
+        if self.wave_event is not None:
+            self.wave_event.cancel()
+        self.wave_event = self.scheduler.schedule_at(
+            self.cycle_start + self.next_wave_time, self.on_wave_timer
+        )
+        
+    def on_wave_timer(self):
+        self.wave_event = None
+        if self.wave_active:
+            # Предыдущая волна еще идет - новая начнется сразу после нее
+            self.wave_pending = True
+            return
+        self.start_wave()
+        self.cycle_start = self.scheduler.time
+        # Случайный интервал между волнами (25-35 секунд)
+        self.next_wave_time = self.rng.silence.randint(25000, 35000)
+        self.schedule_wave()
+        
+    def update(self, dt):
+        if self.wave_active:
+            self.wave_progress += self.WAVE_SPEED * dt
+            
+            if self.wave_progress >= 1.0:
+                self.wave_active = False
+                self.destroy_normal_connections(self.connection_manager)
+                self.wave_progress = 0.0
+                if self.wave_pending:
+                    self.wave_pending = False
+                    self.on_wave_timer()
+                
+    def start_wave(self):
+        self.wave_active = True
+        self.wave_progress = 0.0
+        self.create_wave_particles()
+        
+    def create_wave_particles(self):
+        """Частицы волны - задаются в классе с отрисовкой"""
+
+    def destroy_normal_connections(self, connection_manager):
+        connections_to_remove = []
+        for connection in connection_manager.connections:
+            if connection.type == "normal":
+                connections_to_remove.append(connection)
+                # Эффект разрушения связи
+                self.create_break_effect(connection)
+                
+        connection_manager.remove_connections(connections_to_remove)
+            
+    def create_break_effect(self, connection):
+        """Эффект разрыва связи - задается в классе с отрисовкой"""
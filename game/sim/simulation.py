@@ -0,0 +1,297 @@
+from ..agent import Agent
+from ..scheduler import EventScheduler
+from .node import Node
+from .connection import Connection
+from .virus import Virus
+from .silence import Silence
+from .level import LevelManager
+from .connections import ConnectionManager
+from .rng import RandomStreams
+
+# Шаг симуляции в мс: игра и среды для ботов шагают одинаково
+FIXED_DT = 1000.0 / 60
+# Цена антивирусной атаки на неизолированный вирус
+ANTIVIRUS_COST = 50
+
+class GameState:
+    PLAYING = "playing"
+    WIN = "win"
+    LOSE = "lose"
+
+class Simulation:
+    """Игра без окна и pygame: уровень, связи, вирусы и Тишина.
+    
+    Время идет только через step(dt), поэтому симуляцию можно крутить
+    быстрее реального времени. Классы объектов задаются атрибутами:
+    игра с отрисовкой подставляет наследников с методами draw.
+    Случайность берется только из потоков self.rng, поэтому одно зерно
+    и одна последовательность действий воспроизводят партию.
+    """
+    
+    node_class = Node
+    connection_class = Connection
+    virus_class = Virus
+    silence_class = Silence
+    
+    def __init__(self, seed=None):
+        self.rng = RandomStreams(seed)
+        self.scheduler = EventScheduler()
+        self.agent = Agent()
+        self.silence = self.silence_class(self.rng)
+        self.level_manager = LevelManager(self.agent, self.node_class, self.virus_class, self.rng)
+        self.connection_manager = ConnectionManager(self.scheduler, self.connection_class, self.rng)
+        self.level_manager.add_type_listener(self.connection_manager.on_node_type_changed)
+        
+        self.game_state = GameState.PLAYING
+        self.stars_earned = 0
+        self.player_energy = 0
+        self.level_name = ""
+        self.level_description = ""
+        
+        # Таймер уровня
+        self.level_time = 0
+        self.time_left = 0
+        
+    def load_level(self, level_num, seed=None):
+        """Загружает уровень.
+
+        Без seed партия продолжается: часы планировщика, отсчет до волны
+        Тишины и способности агента переходят с прошлого уровня. С seed
+        уровень начинается как в новой симуляции с этим зерном, поэтому
+        одно зерно и одни действия дают одну партию независимо от
+        сыгранного раньше.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+            self.scheduler.reset()
+            self.agent.reset()
+        else:
+            # Таймеры прошлого уровня больше не нужны
+            self.scheduler.clear()
+        
+        level_config = self.level_manager.load_level(level_num)
+        self.connection_manager.reset(self.level_manager.connections, self.level_manager.nodes,
+                                      self.level_manager.distances)
+        
+        # Настройка волн Тишины
+        if level_config.get("waves", False):
+            self.silence.speed = level_config.get("silence_speed", 0.001)
+            self.silence.wave_interval = level_config.get("wave_interval", 30000)
+        else:
+            self.silence.speed = 0
+        if seed is not None:
+            # Отсчет до первой волны - заново, по интервалу этого уровня,
+            # а не оставшемуся от прошлого
+            self.silence.wave_interval = level_config.get("wave_interval", 30000)
+            self.silence.reset()
+        
+        # Регистрируем таймеры уровня в планировщике
+        self.silence.start(self.scheduler, self.connection_manager)
+        for virus in self.level_manager.viruses:
+            virus.start(self.level_manager, self.connection_manager, self.scheduler.time)
+        self.player_energy = self.level_manager.player_energy
+        self.stars_earned = 0
+        
+        # Настройка уровня
+        self.level_name = level_config.get("name", f"Уровень {level_num}")
+        self.level_description = level_config.get("description", "")
+        
+        # Настройка времени уровня
+        self.level_time = level_config.get("time_limit", 0)
+        self.time_left = self.level_time
+            
+        # Разблокировка способностей в зависимости от уровня
+        if level_num >= 4:
+            self.agent.unlock_ability("enhanced_connections")
+        if level_num >= 6:
+            self.agent.unlock_ability("antivirus")
+            
+        self.game_state = GameState.PLAYING
+        return level_config
+    
+    def create_connection(self, node1, node2, enhanced=False):
+        """Создание соединения между узлами; True, если связь создана"""
+        if node1.type == "virus" or node2.type == "virus":
+            return False
+        
+        connection_type, duration = self.get_connection_type(enhanced)
+        max_length = self.get_max_connection_length()
+    
+        new_energy, message = self.connection_manager.create_connection(
+            node1, node2, connection_type, self.agent, self.player_energy, max_length, duration
+        )   
+        
+        if new_energy != self.player_energy:  # Если соединение создано
+            self.player_energy = new_energy
+            return True
+        return False
+
+    def get_connection_type(self, enhanced=False):
+        """Тип и длительность новой связи по правилам уровня"""
+        # Если уровень поддерживает временные связи, используем их по умолчанию
+        if self.level_manager.level_config.get("temporary_connections", False):
+            return "temporary", self.level_manager.level_config.get("temporary_duration", 10.0)
+        return ("enhanced" if enhanced else "normal"), None
+    
+    def get_max_connection_length(self):
+        """Максимальная длина соединения для текущего уровня"""
+        return self.level_manager.distances.max_length
+
+    def can_destroy_virus(self, virus_node):
+        """Можно ли сейчас уничтожить вирус: изоляцией или антивирусом"""
+        if self.is_isolated(virus_node):
+            return True
+        return self.agent.can_use_antivirus() and self.player_energy >= ANTIVIRUS_COST
+
+    def destroy_virus(self, virus_node):
+        """Игрок может уничтожить вирус"""
+        # Способ 1: Изоляция (все связи разорваны)
+        if self.is_isolated(virus_node):
+            # Удаляем вирус из списка вирусов
+            virus_to_remove = None
+            for virus in self.level_manager.viruses:
+                if virus.node == virus_node:
+                    virus_to_remove = virus
+                    break
+            
+            if virus_to_remove:
+                virus_to_remove.stop()
+                self.level_manager.viruses.remove(virus_to_remove)
+            
+            # Меняем тип узла на нейтральный
+            virus_node.type = "neutral"
+            
+            # Визуальный эффект уничтожения
+            self.create_virus_destruction_effect(virus_node)
+            return True
+        
+        # Способ 2: Антивирусная атака (дорогая способность)
+        if self.agent.can_use_antivirus() and self.player_energy >= ANTIVIRUS_COST:
+            # Удаляем вирус из списка вирусов
+            virus_to_remove = None
+            for virus in self.level_manager.viruses:
+                if virus.node == virus_node:
+                    virus_to_remove = virus
+                    break
+            
+            if virus_to_remove:
+                virus_to_remove.stop()
+                self.level_manager.viruses.remove(virus_to_remove)
+            
+            virus_node.type = "neutral"
+            self.player_energy -= ANTIVIRUS_COST
+            
+            # Визуальный эффект уничтожения
+            self.create_virus_destruction_effect(virus_node)
+            return True
+        
+        return False
+    
+    def is_isolated(self, node):
+        """Проверяет изолирован ли узел от основной сети"""
+        # Узел изолирован если не соединен со стартом через активные связи
+        start_node = self.level_manager.get_node("start")
+        if start_node:
+            # Проверяем изоляцию: нет активных связей с другими узлами
+            has_connections = any(
+                other != node for other in self.connection_manager.neighbors(node)
+            )
+            
+            # Если есть связи, проверяем, соединен ли со стартом
+            if has_connections:
+                return not self.connection_manager.connectivity.is_reachable(node)
+            else:
+                # Нет связей вообще - изолирован
+                return True
+        return True
+    
+    def create_virus_destruction_effect(self, node):
+        """Эффект уничтожения вируса - задается в игре с отрисовкой"""
+    
+    def check_victory(self):
+        """Проверка условий победы"""
+        start_node = self.level_manager.get_node("start")
+        finish_node = self.level_manager.get_node("finish")
+        
+        if not start_node or not finish_node:
+            return False
+        
+        # Достижимость поддерживается инкрементально, DFS каждый кадр не нужен
+        return self.connection_manager.connectivity.is_reachable(finish_node)
+    
+    def calculate_stars(self):
+        """Вычисляет количество звезд за уровень"""
+        stars = 0
+        level_config = self.level_manager.level_config
+        
+        # Звезда 1: Основная победа
+        if self.check_victory():
+            stars += 1
+        
+        # Звезда 2: Время (если есть лимит)
+        if level_config.get("time_limit", 0) > 0:
+            time_bonus = level_config.get("time_bonus", 0.7)  # 70% времени осталось
+            if self.time_left / self.level_time >= time_bonus:
+                stars += 1
+        
+        # Звезда 3: Энергия
+        energy_bonus = level_config.get("energy_bonus", 0.3)  # 30% энергии осталось
+        if self.player_energy / self.level_manager.player_energy >= energy_bonus:
+            stars += 1
+        
+        # Звезда 4: Количество связей
+        max_connections = level_config.get("max_connections", None)
+        if max_connections and len(self.connection_manager.connections) <= max_connections:
+            stars += 1
+        
+        # Звезда 5: Резервный путь
+        start_node = self.level_manager.get_node("start")
+        finish_node = self.level_manager.get_node("finish")
+        if start_node and finish_node:
+            if self.connection_manager.has_backup_path(start_node, finish_node):
+                stars += 1
+        
+        return min(stars, 5)  # Максимум 5 звезд
+
+    def step(self, dt):
+        """Продвигает симуляцию на dt миллисекунд"""
+        if self.game_state == GameState.PLAYING:
+            # Обновляем таймер уровня
+            if self.level_time > 0:
+                self.time_left -= dt / 1000.0
+                if self.time_left <= 0:
+                    self.game_state = GameState.LOSE
+                    return
+            
+            # Обновляем узлы
+            for node in self.level_manager.nodes:
+                node.update(dt)
+            
+            # Срабатывают только наступившие события: отсчет волн Тишины
+            # и истечение временных связей
+            self.scheduler.advance(dt)
+            
+            # Таймеры всех вирусов проверяются одним векторным шагом
+            self.level_manager.virus_swarm.update(self.scheduler.time)
+            
+            # Обновляем анимации связей
+            self.connection_manager.update_connections(dt)
+            
+            # Обновляем системы
+            self.silence.update(dt)
+            
+            # Убираем вирусы, чьи узлы уже не заражены
+            for virus in self.level_manager.viruses[:]:
+                if virus.node.type != "virus":
+                    virus.stop()
+                    self.level_manager.viruses.remove(virus)
+            
+            # Проверяем поражение от вирусов
+            start_node = self.level_manager.get_node("start")
+            if start_node and start_node.type == "virus":
+                self.game_state = GameState.LOSE
+            
+            # Проверяем победу
+            if self.check_victory():
+                self.game_state = GameState.WIN
+                self.stars_earned = self.calculate_stars()
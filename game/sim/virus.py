@@ -0,0 +1,166 @@
+from ..virus_swarm import VirusSwarm, SwarmField, EVOLVE, SPREAD, ATTACK, MOVE
+from .rng import default_rng
+
+class Virus:
+    # Состояние хранится в массивах роя, объект - представление над строкой
+    health = SwarmField("health")
+    evolution_stage = SwarmField("evolution_stage")
+    evolution_interval = SwarmField("intervals", EVOLVE)
+    spread_interval = SwarmField("intervals", SPREAD)
+    attack_interval = SwarmField("intervals", ATTACK)
+    movement_interval = SwarmField("intervals", MOVE)
+    last_spread_time = SwarmField("last_spread", cast=float)
+    
+    def __init__(self, node, swarm=None, rng=None):
+        self.node = node
+        self.type = "advanced"
+        self.rng = rng if rng is not None else default_rng
+        
+        self.swarm = None
+        self.slot = None
+        if swarm is None:
+            swarm = VirusSwarm(capacity=1)
+        # (эволюция, распространение, атака, движение)
+        swarm.add(self, (45000, self.rng.virus.randint(4000, 8000), 10000, 15000))
+        
+        # Контекст уровня задается в start()
+        self.level_manager = None
+        self.connection_manager = None
+        
+    def start(self, level_manager, connection_manager, now=0):
+        """Запускает таймеры вируса с момента now"""
+        self.level_manager = level_manager
+        self.connection_manager = connection_manager
+        self.swarm.start_timers(self, now)
+        
+    def stop(self):
+        """Снимает вирус с таймеров роя"""
+        self.swarm.remove(self)
+                
+    def is_active(self):
+        return self.node.type == "virus"
+                
+    def on_evolve(self):
+        # Эволюция каждые 45 секунд
+        if not self.is_active():
+            return self.stop()
+        self.evolve()
+        
+        # Интервал распространения сократился - переносим уже идущий отсчет
+        next_spread = max(self.swarm.time, self.last_spread_time + self.spread_interval)
+        self.swarm.reschedule(self, SPREAD, next_spread)
+        
+    def on_spread(self):
+        if not self.is_active():
+            return self.stop()
+        self.last_spread_time = self.swarm.time
+        self.try_spread(self.level_manager, self.connection_manager)
+        
+    def on_attack(self):
+        # Атака на связи
+        if not self.is_active():
+            return self.stop()
+        self.attack_connections(self.connection_manager)
+        
+    def on_move(self):
+        # Движение
+        if not self.is_active():
+            return self.stop()
+        self.try_move(self.level_manager, self.connection_manager)
+        
+    def evolve(self):
+        """Вирус эволюционирует и становится сильнее"""
+        self.evolution_stage += 1
+        self.health = min(5, self.health + 1)
+        self.spread_interval = max(2000, self.spread_interval - 1000)
+        
+        # Эффект эволюции
+        self.create_evolution_effect()
+        
+    def create_evolution_effect(self):
+        """Эффект эволюции - задается в классе с отрисовкой"""
+
+    def try_spread(self, level_manager, connection_manager):
+        """Умное распространение - предпочитает узлы ближе к старту"""
+        neighbors = []
+        start_node = level_manager.get_node("start")
+        
+        # Индекс уже исключает firewall, защищенные и не нейтральные узлы
+        for node in connection_manager.infection.get_candidates(self.node):
+            # Оцениваем приоритет (ближе к старту = выше приоритет)
+            priority = 0
+            if start_node:
+                distance_to_start = level_manager.distances.distance(node, start_node)
+                priority = 1.0 / (distance_to_start + 1)
+            
+            neighbors.append((node, priority))
+        
+        if neighbors:
+            # Выбираем узел с учетом приоритета
+            total_priority = sum(priority for _, priority in neighbors)
+            rand_val = self.rng.virus.uniform(0, total_priority)
+            current = 0
+            
+            for node, priority in neighbors:
+                current += priority
+                if rand_val <= current:
+                    self.infect_node(node)
+                    return True
+                    
+        return False
+        
+    def infect_node(self, target_node):
+        """Заражение узла с эффектом"""
+        target_node.type = "virus"
+        self.create_infection_effect(target_node)
+        
+    def create_infection_effect(self, target_node):
+        """Эффект заражения узла - задается в классе с отрисовкой"""
+
+    def attack_connections(self, connection_manager):
+        """Атака на соседние связи"""
+        target_connections = []
+        
+        for connection in connection_manager.get_node_connections(self.node):
+            # Не атакуем усиленные связи и firewall связи
+            if connection.type in ["enhanced", "firewall"]:
+                continue
+            # Предпочитаем обычные связи
+            priority = 2 if connection.type == "normal" else 1
+            target_connections.extend([connection] * priority)
+                
+        if target_connections:
+            target = self.rng.virus.choice(target_connections)
+            # Удаляем через менеджер, чтобы обновить индекс смежности
+            if connection_manager.remove_connection(target):
+                self.create_attack_effect(target)
+            
+    def create_attack_effect(self, connection):
+        """Эффект атаки на связь - задается в классе с отрисовкой"""
+
+    def try_move(self, level_manager, connection_manager):
+        """Попытка переместиться на соседний узел"""
+        # Вирусы не могут перемещаться на firewall узлы
+        neighbors = [node for node in connection_manager.neighbors(self.node)
+                     if node.type == "neutral"]
+                        
+        if neighbors:
+            new_node = self.rng.virus.choice(neighbors)
+            old_node = self.node
+            
+            # Перемещаем вирус
+            self.node.type = "neutral"
+            new_node.type = "virus"
+            self.node = new_node
+            
+            self.create_movement_effect(old_node, new_node)
+            
+    def create_movement_effect(self, old_node, new_node):
+        """Эффект перемещения вируса - задается в классе с отрисовкой"""
+
+    def take_damage(self):
+        """Вирус получает урон"""
+        self.health -= 1
+        if self.health <= 0:
+            return True  # Вирус уничтожен
+        return False
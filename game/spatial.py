@@ -0,0 +1,126 @@
+import math
+
+import numpy as np
+
+
+class SpatialGrid:
+    """Равномерная сетка для быстрого поиска узла под курсором.
+    
+    Каждый узел записывается во все ячейки, которые задевает его круг,
+    поэтому запрос проверяет только узлы одной ячейки. Сетка строится
+    при загрузке уровня и перестраивается только при перемещении узлов.
+    """
+    
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.nodes = []
+        
+    def rebuild(self, nodes=None):
+        """Перестраивает сетку (например, после перемещения узлов)"""
+        if nodes is not None:
+            self.nodes = list(nodes)
+        self.cells = {}
+        size = self.cell_size
+        # Узлы заносятся в порядке списка - первым находится тот же узел,
+        # что и при линейном поиске
+        for node in self.nodes:
+            min_cx = int((node.x - node.radius) // size)
+            max_cx = int((node.x + node.radius) // size)
+            min_cy = int((node.y - node.radius) // size)
+            max_cy = int((node.y + node.radius) // size)
+            for cx in range(min_cx, max_cx + 1):
+                for cy in range(min_cy, max_cy + 1):
+                    self.cells.setdefault((cx, cy), []).append(node)
+                    
+    def node_at(self, pos):
+        """Возвращает узел под точкой pos или None"""
+        x, y = pos
+        cell = self.cells.get((int(x // self.cell_size), int(y // self.cell_size)))
+        if not cell:
+            return None
+        for node in cell:
+            dx = node.x - x
+            dy = node.y - y
+            if dx * dx + dy * dy <= node.radius * node.radius:
+                return node
+        return None
+
+
+class DistanceTable:
+    """Пары узлов уровня, которые можно соединить, и их длины.
+    
+    Узлы не двигаются, поэтому список пар не длиннее max_length строится
+    один раз при загрузке уровня. Пары ищутся по сетке с ячейкой
+    max_length: соседи узла лежат только в его ячейке и восьми соседних,
+    и расстояния считаются только для таких пар. Длины хранятся
+    разреженно (float32 рядом с edges), расстояние между остальными
+    узлами считается по запросу. Узлы адресуются по node.index.
+    """
+    
+    # Своя ячейка и половина соседних: каждая пара ячеек проверяется один раз
+    FORWARD_CELLS = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+    
+    def __init__(self):
+        self.max_length = 0
+        self.edges = np.zeros((0, 2), dtype=np.int32)  # (i, j), i < j, по возрастанию
+        self.lengths = np.zeros(0, dtype=np.float32)  # Длина пары edges[k]
+        self.rows = {}  # (i, j), i < j -> номер строки в edges
+        self.neighbors = []  # Номер узла -> номера соседей по edges
+        
+    def rebuild(self, nodes, max_length):
+        self.max_length = max_length
+        positions = np.array([(node.x, node.y) for node in nodes], dtype=np.float64).reshape(-1, 2)
+        count = len(positions)
+        
+        first, second = [], []
+        if max_length > 0 and count:
+            # Номер ячейки одним числом; поле вокруг сетки - чтобы сдвиг не заворачивался
+            cells = np.floor(positions / max_length).astype(np.int64)
+            cells -= cells.min(axis=0) - 1
+            width = int(cells[:, 1].max()) + 2
+            keys = cells[:, 0] * width + cells[:, 1]
+            order = np.argsort(keys, kind="stable")
+            cell_keys, starts, sizes = np.unique(keys[order], return_index=True, return_counts=True)
+            for dx, dy in self.FORWARD_CELLS:
+                target = keys + dx * width + dy
+                found = np.minimum(np.searchsorted(cell_keys, target), len(cell_keys) - 1)
+                hit_sizes = np.where(cell_keys[found] == target, sizes[found], 0)
+                # Каждый узел в паре со всеми узлами целевой ячейки
+                rows = np.repeat(np.arange(count), hit_sizes)
+                offsets = np.arange(len(rows)) - np.repeat(np.cumsum(hit_sizes) - hit_sizes, hit_sizes)
+                cols = order[np.repeat(starts[found], hit_sizes) + offsets]
+                if (dx, dy) == (0, 0):
+                    # В своей ячейке каждая пара встречается дважды и с самим узлом
+                    keep = rows < cols
+                    rows, cols = rows[keep], cols[keep]
+                first.append(rows)
+                second.append(cols)
+        first = np.concatenate(first) if first else np.zeros(0, dtype=np.int64)
+        second = np.concatenate(second) if second else np.zeros(0, dtype=np.int64)
+        
+        # Расстояния - только для пар из соседних ячеек
+        delta = positions[first] - positions[second]
+        lengths = np.sqrt((delta ** 2).sum(axis=1))
+        close = lengths <= max_length
+        edges = np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1)[close]
+        lengths = lengths[close]
+        order = np.lexsort((edges[:, 1], edges[:, 0]))
+        self.edges = edges[order].astype(np.int32).reshape(-1, 2)
+        self.lengths = lengths[order].astype(np.float32)
+        pairs = [tuple(edge) for edge in self.edges.tolist()]
+        self.rows = {pair: row for row, pair in enumerate(pairs)}
+        self.neighbors = [[] for _ in range(count)]
+        for i, j in pairs:
+            self.neighbors[i].append(j)
+            self.neighbors[j].append(i)
+        for neighbors in self.neighbors:
+            neighbors.sort()
+            
+    def distance(self, node1, node2):
+        i, j = node1.index, node2.index
+        row = self.rows.get((i, j) if i < j else (j, i))
+        if row is not None:
+            return float(self.lengths[row])
+        # Пара длиннее max_length - считаем на месте с той же точностью
+        return float(np.float32(math.hypot(node1.x - node2.x, node1.y - node2.y)))
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+import pygame
+
+# Шаг квантования прозрачности: соседние значения alpha дают один спрайт
+ALPHA_STEP = 8
+# Предел памяти под спрайты (RGBA, 4 байта на пиксель)
+MAX_CACHE_BYTES = 16 * 1024 * 1024
+
+
+def quantize_alpha(alpha, step=ALPHA_STEP):
+    alpha = max(0, min(255, int(alpha)))
+    return min(255, int(round(alpha / step)) * step)
+
+
+class SpriteCache:
+    """LRU-кэш заранее отрисованных полупрозрачных кругов и колец.
+    
+    Вместо новой SRCALPHA-поверхности на каждый круг в каждом кадре
+    отрисовка берет готовый спрайт по ключу (радиус, цвет, alpha, толщина).
+    Alpha квантуется, чтобы пульсирующие эффекты попадали в кэш; при
+    превышении лимита памяти вытесняются давно не использованные спрайты.
+    """
+    
+    def __init__(self, max_bytes=MAX_CACHE_BYTES, alpha_step=ALPHA_STEP):
+        self.max_bytes = max_bytes
+        self.alpha_step = alpha_step
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._sprites = OrderedDict()
+        
+    def clear(self):
+        self._sprites.clear()
+        self.bytes = 0
+        
+    def circle(self, radius, color, alpha=255, width=0):
+        """Круг (width=0) или кольцо радиуса radius на поверхности 2r x 2r"""
+        radius = max(1, int(radius))
+        alpha = quantize_alpha(alpha, self.alpha_step)
+        key = (radius, tuple(color[:3]), alpha, width)
+        
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+        
+        self.misses += 1
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*color[:3], alpha), (radius, radius), radius, width)
+        self._sprites[key] = sprite
+        self.bytes += radius * radius * 16
+        while self.bytes > self.max_bytes and len(self._sprites) > 1:
+            (old_radius, _, _, _), _ = self._sprites.popitem(last=False)
+            self.bytes -= old_radius * old_radius * 16
+        return sprite
+    
+    def blit_circle(self, screen, center, radius, color, alpha=255, width=0):
+        """Выводит круг с центром в center"""
+        radius = max(1, int(radius))
+        sprite = self.circle(radius, color, alpha, width)
+        screen.blit(sprite, (center[0] - radius, center[1] - radius))
+
+
+# Общий кэш для узлов, вирусов, связей и эффектов
+sprite_cache = SpriteCache()
+
+
+def blit_circle(screen, center, radius, color, alpha=255, width=0):
+    sprite_cache.blit_circle(screen, center, radius, color, alpha, width)
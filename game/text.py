@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+import pygame
+
+# Сколько отрисованных строк держать в кэше
+MAX_CACHED_TEXTS = 512
+
+_fonts = {}
+
+
+def get_font(size):
+    """Шрифт по умолчанию нужного размера; создается один раз"""
+    font = _fonts.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
+
+
+class TextCache:
+    """LRU-кэш отрисованных строк.
+    
+    Ключ - (текст, размер, цвет, сглаживание), поэтому неизменные подписи
+    панели рендерятся один раз, а таймеры вроде "Nс" - только когда
+    меняется выводимое число.
+    """
+    
+    def __init__(self, max_entries=MAX_CACHED_TEXTS):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        
+    def clear(self):
+        self._surfaces.clear()
+        
+    def render(self, text, size, color, antialias=True):
+        key = (text, size, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        
+        surface = get_font(size).render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+
+text_cache = TextCache()
+
+
+def render_text(text, size, color, antialias=True):
+    """Отрисованная строка из общего кэша"""
+    return text_cache.render(text, size, color, antialias)
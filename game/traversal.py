@@ -0,0 +1,77 @@
+def is_passable(node):
+    """Через зараженные узлы путь не проходит"""
+    return node.type != "virus"
+
+
+class GraphTraversal:
+    """Итеративные обходы графа связей без рекурсии.
+    
+    Обходы не ограничены глубиной стека Python, а буферы посещений
+    выделяются один раз на уровень: каждый вызов получает новый номер
+    эпохи, и узел считается посещенным, если его отметка равна этому
+    номеру. Поэтому обходы нереентерабельны - результат копируется
+    до следующего вызова.
+    
+    Непроходимый узел (см. passable) попадает в результат, если до него
+    дошли, но сам не раскрывается: зараженный узел достижим, но дальше
+    через него обход не идет.
+    """
+    
+    def __init__(self, neighbors):
+        self.neighbors = neighbors  # node -> соседи по активным связям
+        self._marks = []
+        self._depths = []
+        self._queue = []
+        self._epoch = 0
+        
+    def reset(self, nodes):
+        """Нумерует узлы уровня и выделяет буферы под их количество"""
+        for index, node in enumerate(nodes):
+            node.index = index
+        size = len(nodes)
+        self._marks = [0] * size
+        self._depths = [0] * size
+        self._queue = []
+        self._epoch = 0
+        
+    def _begin(self):
+        self._epoch += 1
+        self._queue.clear()
+        return self._epoch
+    
+    def _bfs(self, sources, passable, max_depth=None, exclude=None):
+        """Общий BFS; посещенные узлы остаются в self._queue"""
+        epoch = self._begin()
+        marks, depths, queue = self._marks, self._depths, self._queue
+        
+        for source in sources:
+            if marks[source.index] == epoch:
+                continue
+            marks[source.index] = epoch
+            depths[source.index] = 0
+            queue.append(source)
+            
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            depth = depths[node.index]
+            if not passable(node) or (max_depth is not None and depth >= max_depth):
+                continue
+            for neighbor in self.neighbors(node):
+                index = neighbor.index
+                if marks[index] == epoch:
+                    continue
+                if exclude is not None and neighbor in exclude:
+                    continue
+                marks[index] = epoch
+                depths[index] = depth + 1
+                queue.append(neighbor)
+    
+    def bfs_order(self, sources, passable=is_passable, max_depth=None, exclude=None):
+        """Узлы в порядке обхода в ширину из одного или нескольких источников.
+        
+        Узлы из exclude считаются уже посещенными и не раскрываются.
+        """
+        self._bfs(sources, passable, max_depth=max_depth, exclude=exclude)
+        return list(self._queue)
@@ -0,0 +1,127 @@
+from operator import methodcaller
+
+import numpy as np
+
+# Столбцы таймеров в порядке обработки для одного вируса
+EVOLVE, SPREAD, ATTACK, MOVE = range(4)
+HANDLERS = tuple(methodcaller(name) for name in ("on_evolve", "on_spread", "on_attack", "on_move"))
+
+
+class SwarmField:
+    """Атрибут вируса, который хранится в массиве роя"""
+    
+    def __init__(self, array_name, column=None, cast=int):
+        self.array_name = array_name
+        self.column = column
+        self.cast = cast
+        
+    def _index(self, virus):
+        if self.column is None:
+            return virus.slot
+        return virus.slot, self.column
+    
+    def __get__(self, virus, owner=None):
+        if virus is None:
+            return self
+        return self.cast(getattr(virus.swarm, self.array_name)[self._index(virus)])
+    
+    def __set__(self, virus, value):
+        getattr(virus.swarm, self.array_name)[self._index(virus)] = value
+
+
+class VirusSwarm:
+    """Состояние всех вирусов уровня в массивах NumPy.
+    
+    Таймеры хранятся как абсолютное время следующего срабатывания, поэтому
+    один кадр - это одно векторное сравнение с текущим временем. В скалярную
+    логику Virus передаются только сработавшие таймеры. Объекты Virus
+    остаются представлениями над строкой массива (virus.slot), так что
+    уничтожение и отрисовка работают как раньше.
+    """
+    
+    def __init__(self, capacity=16, detached=False):
+        self.detached = detached  # Рой одного снятого с уровня вируса
+        self.size = 0
+        self.time = 0
+        self.viruses = []
+        self.next_fire = np.full((capacity, 4), np.inf)
+        self.intervals = np.zeros((capacity, 4))
+        self.last_spread = np.zeros(capacity)
+        self.health = np.zeros(capacity, dtype=np.int32)
+        self.evolution_stage = np.zeros(capacity, dtype=np.int32)
+        
+    def _arrays(self):
+        return ("next_fire", "intervals", "last_spread", "health", "evolution_stage")
+    
+    def _grow(self):
+        for name in self._arrays():
+            array = getattr(self, name)
+            grown = np.zeros((len(array) * 2,) + array.shape[1:], dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+        self.next_fire[self.size:] = np.inf
+        
+    def add(self, virus, intervals, health=3, evolution_stage=1):
+        """Выделяет вирусу строку массивов; intervals - (эволюция, распространение, атака, движение)"""
+        if self.size == len(self.health):
+            self._grow()
+        slot = self.size
+        self.size += 1
+        self.viruses.append(virus)
+        self.next_fire[slot] = np.inf
+        self.intervals[slot] = intervals
+        self.last_spread[slot] = self.time
+        self.health[slot] = health
+        self.evolution_stage[slot] = evolution_stage
+        virus.swarm = self
+        virus.slot = slot
+        
+    def remove(self, virus):
+        """Убирает вирус из роя; его состояние переезжает в отдельный рой"""
+        if virus.swarm is not self or self.detached:
+            return
+        slot = virus.slot
+        detached = VirusSwarm(capacity=1, detached=True)
+        detached.add(virus, self.intervals[slot], self.health[slot], self.evolution_stage[slot])
+        detached.last_spread[0] = self.last_spread[slot]
+        
+        last = self.size - 1
+        if slot != last:
+            for name in self._arrays():
+                array = getattr(self, name)
+                array[slot] = array[last]
+            moved = self.viruses[last]
+            moved.slot = slot
+            self.viruses[slot] = moved
+        self.viruses.pop()
+        self.next_fire[last] = np.inf
+        self.size -= 1
+        
+    def start_timers(self, virus, now):
+        """Запускает все таймеры вируса с момента now"""
+        slot = virus.slot
+        self.next_fire[slot] = now + self.intervals[slot]
+        self.last_spread[slot] = now
+        
+    def reschedule(self, virus, kind, time):
+        self.next_fire[virus.slot, kind] = time
+        
+    def update(self, now):
+        """Срабатывают все таймеры с временем <= now, по порядку времени"""
+        while self.size:
+            fire = self.next_fire[:self.size]
+            slots, kinds = np.nonzero(fire <= now)
+            if len(slots) == 0:
+                break
+            times = fire[slots, kinds]
+            order = np.lexsort((kinds, slots, times))
+            due = [(times[i], kinds[i], self.viruses[slots[i]]) for i in order]
+            for time, kind, virus in due:
+                # Вирус мог быть удален или таймер перенесен предыдущим событием
+                if virus.swarm is not self or self.next_fire[virus.slot, kind] != time:
+                    continue
+                self.time = time
+                self.next_fire[virus.slot, kind] = time + self.intervals[virus.slot, kind]
+                HANDLERS[kind](virus)
+        self.time = now
+
@@ -1,5 +1,22 @@
-from game.core import Game
+import argparse
+from game.core import Game, TIME_SCALES
+from game.levels import registry
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Синапсис")
+    # Перерисовывать только изменившиеся области (слабые машины)
+    parser.add_argument("--dirty-rects", action="store_true")
+    # Зерно случайности: одинаковое зерно и действия дают одинаковую партию
+    parser.add_argument("--seed", type=int, default=None)
+    # Начальная скорость симуляции, например 16 для прогона длинных уровней
+    parser.add_argument("--time-scale", type=float, default=1, choices=TIME_SCALES)
+    # Каталог с дополнительными уровнями level_<номер>.py
+    parser.add_argument("--level-pack", action="append", default=[])
+    args = parser.parse_args()
+    
+    for directory in args.level_pack:
+        registry.add_pack(directory)
+    
+    game = Game(dirty_rects=args.dirty_rects, seed=args.seed)
+    game.set_time_scale(args.time_scale)
+    game.run()